@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import functools
+import heapq
 import re
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional, Set, Tuple
+from types import MappingProxyType
+from typing import Callable, Dict, FrozenSet, List, Optional, Set, Tuple
 
 import polars as pl
 
@@ -36,13 +39,78 @@ class ChallengeFilter:
     # Only the relevant fields are populated per challenge type
     typecodes: Optional[Set[str]] = None
     airport_icao: Optional[Set[str]] = None
-    origin_codes: Optional[Set[str]] = None  # for AIRPORT_PAIR: side A codes
-    destination_codes: Optional[Set[str]] = None  # for AIRPORT_PAIR: side B codes
+    origin_codes: Optional[Set[str]] = None  # AIRPORT_PAIR/ROUTE: side A codes
+    destination_codes: Optional[Set[str]] = None  # AIRPORT_PAIR/ROUTE: side B codes
     route_name: Optional[str] = None
     tier: Optional[str] = None
     min_lat: Optional[float] = None  # for latitude-based filters
     max_lat: Optional[float] = None
 
+    # Lazily-built typed Series views of the code sets above, stored
+    # pre-imploded (one list row) as is_in expects. Parsed challenges are
+    # reused across server refreshes, so handing is_in an already-typed
+    # Series skips the per-call set -> column conversion.
+    _match_series: Dict[str, Optional[pl.Series]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    # Beyond this many origin|destination keys, enumerating the pairs
+    # costs more than the extra membership scans it saves
+    _MAX_PAIR_KEYS = 10_000
+
+    def typecode_series(self) -> pl.Series:
+        s = self._match_series.get("typecodes")
+        if s is None:
+            s = pl.Series("typecodes", list(self.typecodes), dtype=pl.String).implode()
+            self._match_series["typecodes"] = s
+        return s
+
+    def airport_code_series(self) -> pl.Series:
+        s = self._match_series.get("airports")
+        if s is None:
+            # FR24 data uses IATA codes (e.g. "SYD"), but challenge
+            # resolution produces ICAO codes (e.g. "YSSY"). Match either.
+            codes = set(self.airport_icao)
+            for icao in self.airport_icao:
+                iata = ICAO_TO_IATA.get(icao)
+                if iata:
+                    codes.add(iata)
+            s = pl.Series("airports", list(codes), dtype=pl.String).implode()
+            self._match_series["airports"] = s
+        return s
+
+    def pair_series(self) -> Optional[pl.Series]:
+        """Valid "origin|destination" keys for both directions of the pair.
+
+        Returns None when the code product is too large to enumerate; the
+        caller then falls back to the per-side membership masks.
+        """
+        if "pairs" not in self._match_series:
+            a, b = self.origin_codes, self.destination_codes
+            if len(a) * len(b) * 2 > self._MAX_PAIR_KEYS:
+                self._match_series["pairs"] = None
+            else:
+                pairs = {f"{o}|{d}" for o in a for d in b}
+                pairs.update(f"{o}|{d}" for o in b for d in a)
+                self._match_series["pairs"] = pl.Series(
+                    "pairs", list(pairs), dtype=pl.String
+                ).implode()
+        return self._match_series["pairs"]
+
+    def origin_series(self) -> pl.Series:
+        s = self._match_series.get("origins")
+        if s is None:
+            s = pl.Series("origins", list(self.origin_codes), dtype=pl.String).implode()
+            self._match_series["origins"] = s
+        return s
+
+    def destination_series(self) -> pl.Series:
+        s = self._match_series.get("destinations")
+        if s is None:
+            s = pl.Series("destinations", list(self.destination_codes), dtype=pl.String).implode()
+            self._match_series["destinations"] = s
+        return s
+
 
 # ---------------------------------------------------------------------------
 # Airport name -> ICAO lookup (notable airports likely in Skycards challenges)
@@ -206,6 +274,23 @@ _EXTRA_IATA: Dict[str, str] = {
 }
 IATA_TO_ICAO.update(_EXTRA_IATA)
 
+# Reverse map, computed once at import (last-wins on duplicate ICAO, same
+# as the per-call comprehension it replaces)
+ICAO_TO_IATA: Dict[str, str] = {v: k for k, v in IATA_TO_ICAO.items()}
+
+# Case-folded union of every airport spelling we know — names, IATA
+# codes and known ICAO codes map straight to their ICAO code, so the
+# common resolution path is one dict hit instead of regex checks plus
+# sequential lookups. IATA entries go in last to keep the original
+# code-before-name precedence for 3-letter strings.
+ALL_AIRPORTS: Dict[str, str] = {}
+ALL_AIRPORTS.update(AIRPORT_LOOKUP)
+for _icao in set(IATA_TO_ICAO.values()) | set(AIRPORT_LOOKUP.values()):
+    ALL_AIRPORTS[_icao.lower()] = _icao
+for _iata, _icao in IATA_TO_ICAO.items():
+    ALL_AIRPORTS[_iata.lower()] = _icao
+del _iata, _icao
+
 
 # ---------------------------------------------------------------------------
 # Region detection via IATA-to-region lookup + coordinate fallback
@@ -216,10 +301,10 @@ IATA_TO_ICAO.update(_EXTRA_IATA)
 IATA_REGIONS: Dict[str, str] = {}
 
 def _build_iata_regions() -> None:
-    """Populate IATA_REGIONS from the IATA_TO_ICAO mapping and known patterns."""
-    if IATA_REGIONS:
-        return  # already built
+    """Populate IATA_REGIONS from the IATA_TO_ICAO mapping and known patterns.
 
+    Called exactly once, below; the table is frozen right after.
+    """
     # Map ICAO first-letter -> region (works for 4-letter ICAO codes)
     icao_prefix_to_region = {
         "K": "americas", "P": "americas", "C": "americas", "M": "americas",
@@ -309,20 +394,31 @@ def _build_iata_regions() -> None:
         IATA_REGIONS.setdefault(code, "africa")
 
 
+# Build once at import so lookups don't re-check on every call, then
+# freeze — the table is static and nothing may mutate it afterwards
+_build_iata_regions()
+IATA_REGIONS = MappingProxyType(IATA_REGIONS)
+
+
 def _get_region_for_iata(code: str) -> Optional[str]:
     """Get region for a 3-letter IATA airport code."""
-    _build_iata_regions()
-    return IATA_REGIONS.get(code.upper()) if code else None
+    if not code:
+        return None
+    # Keys are stored uppercase and callers nearly always pass uppercase
+    # codes; only pay the .upper() string copy when one actually isn't
+    return IATA_REGIONS.get(code if code.isupper() else code.upper())
 
 
-ROUTE_DEFINITIONS: Dict[str, Dict[str, set]] = {
+# Frozen: these sets are probed per-flight during route filtering and are
+# never mutated, so share the immutable versions across calls/threads
+ROUTE_DEFINITIONS: Dict[str, Dict[str, FrozenSet[str]]] = {
     "transpacific": {
-        "side_a": {"asia", "oceania"},
-        "side_b": {"americas"},
+        "side_a": frozenset({"asia", "oceania"}),
+        "side_b": frozenset({"americas"}),
     },
     "transatlantic": {
-        "side_a": {"europe", "africa", "middle_east"},
-        "side_b": {"americas"},
+        "side_a": frozenset({"europe", "africa", "middle_east"}),
+        "side_b": frozenset({"americas"}),
     },
 }
 
@@ -331,30 +427,69 @@ ROUTE_DEFINITIONS: Dict[str, Dict[str, set]] = {
 # Index builders (from Skycards models data)
 # ---------------------------------------------------------------------------
 
+# Columnar view of the models rows, rebuilt only when the rows list
+# changes (same identity-keying as the index caches below). Lowercased
+# helper columns are materialized once so every text match below is a
+# vectorized scan instead of per-row .get()/.lower() calls.
+_models_df_cache: Tuple[int, Optional[pl.DataFrame]] = (0, None)
+
+_MODELS_SCHEMA = {
+    "id": pl.String,
+    "name": pl.String,
+    "manufacturer": pl.String,
+    "type": pl.String,
+    "military": pl.Boolean,
+}
+
+
+def _get_models_df(rows: list) -> pl.DataFrame:
+    """Return the columnar models frame for rows, rebuilding only on change."""
+    global _models_df_cache
+    key = id(rows)
+    if _models_df_cache[0] != key:
+        df = pl.DataFrame(
+            {
+                "id": [r.get("id", "") for r in rows],
+                "name": [r.get("name", "") for r in rows],
+                "manufacturer": [r.get("manufacturer", "") for r in rows],
+                "type": [r.get("type", "") for r in rows],
+                "military": [bool(r.get("military", False)) for r in rows],
+            },
+            schema=_MODELS_SCHEMA,
+        ).with_columns(
+            pl.col("id").str.to_lowercase().alias("id_lower"),
+            pl.col("name").str.to_lowercase().alias("name_lower"),
+            pl.col("manufacturer").str.to_lowercase().alias("mfr_lower"),
+        )
+        _models_df_cache = (key, df)
+    return _models_df_cache[1]
+
+
 def _build_manufacturer_index(rows: list) -> Dict[str, Tuple[str, Set[str]]]:
     """Map normalized manufacturer names -> (canonical name, set of typecodes).
 
     Multiple normalization keys per manufacturer allow fuzzy matching.
     """
-    # First pass: group typecodes by manufacturer
-    mfr_codes: Dict[str, Set[str]] = {}
-    for row in rows:
-        mfr = row.get("manufacturer", "")
-        code = row.get("id", "")
-        if mfr and code:
-            mfr_codes.setdefault(mfr, set()).add(code)
+    # First pass: group typecodes by manufacturer (vectorized)
+    grouped = (
+        _get_models_df(rows)
+        .filter((pl.col("manufacturer") != "") & (pl.col("id") != ""))
+        .group_by("manufacturer", maintain_order=True)
+        .agg(pl.col("id").unique())
+    )
 
     # Second pass: build index with normalized keys
     index: Dict[str, Tuple[str, Set[str]]] = {}
-    for mfr, codes in mfr_codes.items():
+    for mfr, ids in grouped.iter_rows():
+        codes = set(ids)
         value = (mfr, codes)
         # Exact lowercase
         index[mfr.lower()] = value
         # Without apostrophes/hyphens
-        clean = mfr.lower().replace("'", "").replace("-", " ").strip()
+        clean = mfr.lower().translate(_STRIP_PUNCT_TABLE).strip()
         index[clean] = value
         # Collapsed (no spaces/punctuation)
-        collapsed = re.sub(r"[^a-z0-9]", "", mfr.lower())
+        collapsed = _collapse_alnum(mfr.lower())
         index[collapsed] = value
         # First word only (for multi-word: "GULFSTREAM AEROSPACE" -> "gulfstream")
         first_word = mfr.lower().split()[0] if " " in mfr else None
@@ -364,65 +499,265 @@ def _build_manufacturer_index(rows: list) -> Dict[str, Tuple[str, Set[str]]]:
     return index
 
 
-def _build_class_typecodes(rows: list) -> Dict[str, Set[str]]:
+def _build_class_typecodes(rows: list) -> Dict[str, FrozenSet[str]]:
     """Build typecode sets for aircraft classes (helicopter, military, etc.)."""
-    classes: Dict[str, Set[str]] = {
-        "helicopter": set(),
-        "military": set(),
-        "gyrocopter": set(),
-        "autogyro": set(),
-        "tiltrotor": set(),
-        "amphibian": set(),
-        "glider": set(),
+    df = _get_models_df(rows).filter(pl.col("id") != "")
+
+    def _ids(mask: pl.Expr) -> FrozenSet[str]:
+        return frozenset(df.filter(mask)["id"].to_list())
+
+    gyro = _ids(pl.col("type") == "G")
+    return {
+        "helicopter": _ids(pl.col("type") == "H"),
+        "military": _ids(pl.col("military")),
+        "gyrocopter": gyro,
+        # Frozen sets are immutable, so the alias can share the same object
+        "autogyro": gyro,
+        "tiltrotor": _ids(pl.col("type") == "T"),
+        "amphibian": _ids(pl.col("type") == "A"),
+        # Gliders also matched by name/ID (Skycards types them as 'L')
+        "glider": _ids(
+            (pl.col("type") == "S")
+            | pl.col("name_lower").str.contains("glider", literal=True)
+            | pl.col("id").is_in(["GLID", "GLIM"])
+        ),
     }
-    for row in rows:
-        code = row.get("id", "")
-        if not code:
-            continue
-        atype = row.get("type", "")
-        name = row.get("name", "").lower()
-        if atype == "H":
-            classes["helicopter"].add(code)
-        elif atype == "G":
-            classes["gyrocopter"].add(code)
-            classes["autogyro"].add(code)
-        elif atype == "T":
-            classes["tiltrotor"].add(code)
-        elif atype == "A":
-            classes["amphibian"].add(code)
-        elif atype == "S":
-            classes["glider"].add(code)
-        # Also match gliders by name/ID (Skycards types them as 'L')
-        if "glider" in name or code in ("GLID", "GLIM"):
-            classes["glider"].add(code)
-        if row.get("military", False):
-            classes["military"].add(code)
-    return classes
+
+
+# Single-entry caches for the per-models-data indices. Parsing a batch of
+# daily challenges hits these with the same rows list every time; keying
+# on id() is safe because the caller holds models_data alive while parsing.
+_mfr_index_cache: Tuple[int, Optional[Dict[str, Tuple[str, Set[str]]]]] = (0, None)
+_class_codes_cache: Tuple[int, Optional[Dict[str, FrozenSet[str]]]] = (0, None)
+
+
+def _get_manufacturer_index(rows: list) -> Dict[str, Tuple[str, Set[str]]]:
+    """Return the manufacturer index for rows, rebuilding only when rows change."""
+    global _mfr_index_cache
+    key = id(rows)
+    if _mfr_index_cache[0] != key:
+        _mfr_index_cache = (key, _build_manufacturer_index(rows))
+    return _mfr_index_cache[1]
+
+
+def _get_class_typecodes(rows: list) -> Dict[str, FrozenSet[str]]:
+    """Return the aircraft-class typecode sets, rebuilding only when rows change."""
+    global _class_codes_cache
+    key = id(rows)
+    if _class_codes_cache[0] != key:
+        _class_codes_cache = (key, _build_class_typecodes(rows))
+    return _class_codes_cache[1]
+
+
+# Alternation regex over the manufacturer index keys, longest-first so the
+# leftmost alternative that matches is the longest prefix. One anchored
+# regex match replaces a startswith() probe per index key during parsing.
+_mfr_prefix_re_cache: Tuple[int, Optional[re.Pattern]] = (0, None)
+
+
+def _get_mfr_prefix_re(rows: list) -> re.Pattern:
+    """Return the manufacturer longest-prefix regex, rebuilding only when rows change."""
+    global _mfr_prefix_re_cache
+    key = id(rows)
+    if _mfr_prefix_re_cache[0] != key:
+        keys = sorted(_get_manufacturer_index(rows), key=len, reverse=True)
+        if keys:
+            pattern = re.compile("^(" + "|".join(map(re.escape, keys)) + ")")
+        else:
+            pattern = re.compile(r"(?!)")  # never matches
+        _mfr_prefix_re_cache = (key, pattern)
+    return _mfr_prefix_re_cache[1]
 
 
 # ---------------------------------------------------------------------------
 # Challenge parser
 # ---------------------------------------------------------------------------
 
+# All parser patterns compiled once at import; Pattern methods skip the
+# per-call cache lookup that re.search(str, ...) pays
+_RE_NONALNUM = re.compile(r"[^a-z0-9]")
+
+# Drops apostrophes and turns hyphens into spaces in one pass, where the
+# chained .replace() calls rebuilt the string twice
+_STRIP_PUNCT_TABLE = str.maketrans({"'": "", "-": " "})
+
+# Deletion table for the collapsed normalization key: maps every ASCII
+# non-alphanumeric char to None, so str.translate strips them in one
+# C-level pass instead of a regex substitution
+_KEEP_ALNUM_TABLE = str.maketrans(
+    "", "", "".join(chr(c) for c in range(128) if not chr(c).isalnum())
+)
+
+
+def _collapse_alnum(text_lower: str) -> str:
+    """Strip non-alphanumeric chars from already-lowercased text.
+
+    The translate fast path covers ASCII, i.e. essentially every aviation
+    manufacturer string; anything with non-ASCII chars falls back to the
+    regex so accented characters are still dropped like before.
+    """
+    if text_lower.isascii():
+        return text_lower.translate(_KEEP_ALNUM_TABLE)
+    return _RE_NONALNUM.sub("", text_lower)
+_RE_CATCH_PREFIX = re.compile(r"^catch\s+(?:a|an)\s+", re.IGNORECASE)
+_RE_ROUTE = re.compile(r"(transpacific|transatlantic)", re.IGNORECASE)
+_RE_NORTH_OF = re.compile(r"north\s+of", re.IGNORECASE)
+_RE_FROM_TO = re.compile(
+    r"(?:flight\s+)?(?:going\s+)?from\s+(.+?)\s+to\s+(.+?)(?:\s+or\s+back)?(?:\s+airport)?\.?$",
+    re.IGNORECASE,
+)
+_RE_TO_OR_FROM = re.compile(
+    r"(?:flight\s+)?(?:going\s+)?(?:to|from)\s+(?:or\s+(?:to|from)\s+)?(.+?)(?:\s+airport)?(?:\s+in\s+the\s+world)?\.?$",
+    re.IGNORECASE,
+)
+_RE_PAREN = re.compile(r"\(([^)]+)\)")
+_RE_OR_SPLIT = re.compile(r"\s+or\s+", re.IGNORECASE)
+_RE_BACK = re.compile(r"\bback\b", re.IGNORECASE)
+_RE_TIER = re.compile(
+    r"\b(ultra|rare|scarce|uncommon|common|historical|fantasy)\b", re.IGNORECASE
+)
+_RE_CLASS = re.compile(
+    r"\b(helicopter|military|gyrocopter|autogyro|tiltrotor|amphibian|glider)\b",
+    re.IGNORECASE,
+)
+_RE_TRAILING_NOUN = re.compile(
+    r"\s*(?:aircraft|plane|airplane|aeroplane)s?\s*$", re.IGNORECASE
+)
+
+# Latitude-region phrases, in priority order (first match wins, same as
+# the original per-call dict scan). None values are handled directionally
+# in the parser.
+_LAT_REGIONS: Dict[str, Optional[dict]] = {
+    "arctic circle": {"min_lat": 66.5, "max_lat": None, "desc": "north of the Arctic Circle (above 66.5N)"},
+    "artic circle": {"min_lat": 66.5, "max_lat": None, "desc": "north of the Arctic Circle (above 66.5N)"},
+    "antarctic circle": {"min_lat": None, "max_lat": -66.5, "desc": "south of the Antarctic Circle (below 66.5S)"},
+    "antartic circle": {"min_lat": None, "max_lat": -66.5, "desc": "south of the Antarctic Circle (below 66.5S)"},
+    "equator": None,  # handled directionally below
+    "tropic of cancer": None,
+    "tropic of capricorn": None,
+}
+
+# Aho-Corasick automaton over the region phrases: one linear scan of the
+# text finds every literal hit instead of a substring probe per phrase.
+# Falls back to the sequential probes when pyahocorasick is missing.
+try:
+    import ahocorasick as _ahocorasick
+except ImportError:
+    _LAT_REGION_AC = None
+else:
+    _LAT_REGION_AC = _ahocorasick.Automaton()
+    for _i, _phrase in enumerate(_LAT_REGIONS):
+        _LAT_REGION_AC.add_word(_phrase, (_i, _phrase))
+    _LAT_REGION_AC.make_automaton()
+    del _i, _phrase
+
+
+def _match_lat_region(text_lower: str) -> Optional[str]:
+    """Return the highest-priority latitude-region phrase found in text."""
+    if _LAT_REGION_AC is not None:
+        hits = [val for _, val in _LAT_REGION_AC.iter(text_lower)]
+        return min(hits)[1] if hits else None
+    for region_key in _LAT_REGIONS:
+        if region_key in text_lower:
+            return region_key
+    return None
+
+
+# Combined keyword prescan: one pass over the text flags which keyword
+# branches (route / latitude region / tier / class) can possibly match,
+# so the cascade skips their individual probes on a miss
+_RE_KEYWORD_PRESCAN = re.compile(
+    r"(?P<route>transpacific|transatlantic)"
+    r"|(?P<latregion>arc?tic\s+circle|antarc?tic\s+circle|equator"
+    r"|tropic\s+of\s+cancer|tropic\s+of\s+capricorn)"
+    r"|(?P<tier>\b(?:ultra|rare|scarce|uncommon|common|historical|fantasy)\b)"
+    r"|(?P<cls>\b(?:helicopter|military|gyrocopter|autogyro|tiltrotor"
+    r"|amphibian|glider)\b)",
+    re.IGNORECASE,
+)
+
+# Airport keys bucketed by length: a query of length L can only match
+# keys within the allowed edit radius, so the fuzzy scan probes a few
+# buckets instead of the whole lookup
+AIRPORT_KEYS_BY_LEN: Dict[int, List[str]] = {}
+for _key in AIRPORT_LOOKUP:
+    AIRPORT_KEYS_BY_LEN.setdefault(len(_key), []).append(_key)
+del _key
+
+# Every trigram occurring in an airport key. A query sharing no trigram
+# with any key is nowhere near the edit radius, so the fuzzy pass can be
+# skipped outright — prefilter-then-refine.
+AIRPORT_TRIGRAMS: Set[str] = {
+    key[i : i + 3]
+    for key in AIRPORT_LOOKUP
+    for i in range(len(key) - 2)
+}
+
+# rapidfuzz's bit-parallel Levenshtein with early-exit pruning is ~100x
+# faster than the Python DP loop; fall back to the latter if unavailable
+try:
+    from rapidfuzz import process as _rf_process
+    from rapidfuzz.distance import Levenshtein as _rf_levenshtein
+except ImportError:
+    _rf_process = None
+
+
 def _fuzzy_match_airport(name: str) -> Optional[str]:
     """Fuzzy-match an airport name against AIRPORT_LOOKUP using edit distance."""
     name_lower = name.lower()
+    if len(name_lower) < 3:
+        return None
+    # Cheap trigram prefilter: bail before the edit-distance pass when
+    # the query shares nothing with any key
+    if not any(
+        name_lower[i : i + 3] in AIRPORT_TRIGRAMS
+        for i in range(len(name_lower) - 2)
+    ):
+        return None
+    # Allow up to 2 edits, or 1 edit per 4 chars (whichever is greater)
+    max_allowed = max(2, len(name_lower) // 4)
+    # Keys whose length differs by more than the edit radius can't match
+    candidates = [
+        key
+        for length in range(len(name_lower) - max_allowed, len(name_lower) + max_allowed + 1)
+        for key in AIRPORT_KEYS_BY_LEN.get(length, ())
+    ]
+    if not candidates:
+        return None
+    if _rf_process is not None:
+        match = _rf_process.extractOne(
+            name_lower,
+            candidates,
+            scorer=_rf_levenshtein.distance,
+            score_cutoff=max_allowed,
+        )
+        return AIRPORT_LOOKUP[match[0]] if match else None
     best_match = None
-    best_dist = float("inf")
-    for key in AIRPORT_LOOKUP:
-        d = _edit_distance(name_lower, key)
-        # Allow up to 2 edits, or 1 edit per 4 chars (whichever is greater)
-        max_allowed = max(2, len(key) // 4)
-        if d < best_dist and d <= max_allowed:
+    best_dist = max_allowed + 1
+    for key in candidates:
+        # Tighten the cutoff as better matches appear so later keys bail
+        # out of the DP early
+        d = _edit_distance(name_lower, key, cutoff=best_dist - 1)
+        if d < best_dist:
             best_dist = d
             best_match = key
+            if best_dist == 0:
+                break
     return AIRPORT_LOOKUP[best_match] if best_match else None
 
 
-def _edit_distance(a: str, b: str) -> int:
-    """Compute Levenshtein edit distance between two strings."""
+def _edit_distance(a: str, b: str, cutoff: Optional[int] = None) -> int:
+    """Compute Levenshtein edit distance between two strings.
+
+    With ``cutoff``, gives up as soon as no cell in the current DP row can
+    come back under the threshold and returns ``cutoff + 1`` — the same
+    score_cutoff pruning rapidfuzz applies natively.
+    """
     if len(a) < len(b):
-        return _edit_distance(b, a)
+        return _edit_distance(b, a, cutoff)
+    if cutoff is not None and len(a) - len(b) > cutoff:
+        # Length gap alone already exceeds the budget
+        return cutoff + 1
     if len(b) == 0:
         return len(a)
     prev = list(range(len(b) + 1))
@@ -431,6 +766,8 @@ def _edit_distance(a: str, b: str) -> int:
         for j, cb in enumerate(b):
             cost = 0 if ca == cb else 1
             curr.append(min(prev[j + 1] + 1, curr[j] + 1, prev[j] + cost))
+        if cutoff is not None and min(curr) > cutoff:
+            return cutoff + 1
         prev = curr
     return prev[len(b)]
 
@@ -438,17 +775,19 @@ def _edit_distance(a: str, b: str) -> int:
 def _resolve_airport(name: str) -> Optional[str]:
     """Try to resolve an airport name/code to an ICAO code."""
     name = name.strip()
-    # Direct ICAO code (4 uppercase letters)
-    if re.match(r"^[A-Z]{4}$", name):
+    # Combined name/IATA/ICAO table: one case-folded hit covers the
+    # common path
+    hit = ALL_AIRPORTS.get(name.lower())
+    if hit:
+        return hit
+    # Direct ICAO code not in our tables (4 uppercase letters). Plain
+    # string predicates run as single C calls, cheaper than the regex
+    # engine for fixed-length alphabetic tests
+    if len(name) == 4 and name.isascii() and name.isalpha() and name.isupper():
         return name
-    # IATA code (3 uppercase letters)
-    upper = name.upper()
-    if re.match(r"^[A-Z]{3}$", upper):
-        return IATA_TO_ICAO.get(upper)
-    # Exact name lookup
-    result = AIRPORT_LOOKUP.get(name.lower())
-    if result:
-        return result
+    # Unknown IATA-looking code: never fuzzy-match 3-letter strings
+    if len(name) == 3 and name.isascii() and name.isalpha():
+        return None
     # Fuzzy match (handles typos like "madris" -> "madrid")
     return _fuzzy_match_airport(name)
 
@@ -459,7 +798,6 @@ def _resolve_city_airports(name: str) -> Set[str]:
     For multi-airport cities (e.g. "London" → LHR, LGW, STN, LTN, LCY),
     returns all airports. Falls back to single-airport resolution.
     """
-    icao_to_iata = {v: k for k, v in IATA_TO_ICAO.items()}
     codes: Set[str] = set()
 
     # Check CITY_AIRPORTS first for multi-airport coverage
@@ -467,7 +805,7 @@ def _resolve_city_airports(name: str) -> Set[str]:
     if city_key in CITY_AIRPORTS:
         for icao in CITY_AIRPORTS[city_key]:
             codes.add(icao)
-            iata = icao_to_iata.get(icao)
+            iata = ICAO_TO_IATA.get(icao)
             if iata:
                 codes.add(iata)
         return codes
@@ -476,7 +814,7 @@ def _resolve_city_airports(name: str) -> Set[str]:
     icao = _resolve_airport(name)
     if icao:
         codes.add(icao)
-        iata = icao_to_iata.get(icao)
+        iata = ICAO_TO_IATA.get(icao)
         if iata:
             codes.add(iata)
     return codes
@@ -486,7 +824,7 @@ def _clean_challenge_text(text: str) -> str:
     """Strip common prefixes/suffixes from challenge text."""
     text = text.strip()
     # Remove "Catch a/an" prefix
-    text = re.sub(r"^catch\s+(?:a|an)\s+", "", text, flags=re.IGNORECASE)
+    text = _RE_CATCH_PREFIX.sub("", text)
     return text.strip()
 
 
@@ -500,34 +838,37 @@ def parse_challenge(text: str, models_data: dict) -> ChallengeFilter:
     cleaned = _clean_challenge_text(original)
     rows = models_data.get("rows", [])
 
+    # One combined pass flags which keyword branches can match at all;
+    # branches whose group didn't fire skip their probes entirely
+    kw = {m.lastgroup for m in _RE_KEYWORD_PRESCAN.finditer(cleaned)}
+
     # --- Route-based ---
-    route_match = re.search(r"(transpacific|transatlantic)", cleaned, re.IGNORECASE)
+    route_match = _RE_ROUTE.search(cleaned) if "route" in kw else None
     if route_match:
         route_name = route_match.group(1).lower()
+        # Resolve the side regions to code sets now so the filter hot
+        # path never touches ROUTE_DEFINITIONS or the region tables
+        sides = _route_side_code_sets(route_name)
+        origin_codes, destination_codes = sides if sides else (None, None)
         return ChallengeFilter(
             challenge_type=ChallengeType.ROUTE,
             original_text=original,
             description=f"Flights on {route_name} routes",
             route_name=route_name,
+            origin_codes=origin_codes,
+            destination_codes=destination_codes,
         )
 
     # --- Latitude/region-based ---
     # "north of the arctic circle", "south of the equator", etc.
-    lat_regions = {
-        "arctic circle": {"min_lat": 66.5, "max_lat": None, "desc": "north of the Arctic Circle (above 66.5N)"},
-        "artic circle": {"min_lat": 66.5, "max_lat": None, "desc": "north of the Arctic Circle (above 66.5N)"},
-        "antarctic circle": {"min_lat": None, "max_lat": -66.5, "desc": "south of the Antarctic Circle (below 66.5S)"},
-        "antartic circle": {"min_lat": None, "max_lat": -66.5, "desc": "south of the Antarctic Circle (below 66.5S)"},
-        "equator": None,  # handled directionally below
-        "tropic of cancer": None,
-        "tropic of capricorn": None,
-    }
-    for region_key, bounds in lat_regions.items():
-        if region_key in cleaned.lower():
+    if "latregion" in kw:
+        region_key = _match_lat_region(cleaned.lower())
+        if region_key is not None:
+            bounds = _LAT_REGIONS[region_key]
             if bounds is None:
                 # Directional: check "north of" vs "south of"
                 if region_key == "equator":
-                    if re.search(r"north\s+of", cleaned, re.IGNORECASE):
+                    if _RE_NORTH_OF.search(cleaned):
                         bounds = {"min_lat": 0, "max_lat": None, "desc": "north of the Equator"}
                     else:
                         bounds = {"min_lat": None, "max_lat": 0, "desc": "south of the Equator"}
@@ -543,14 +884,9 @@ def parse_challenge(text: str, models_data: dict) -> ChallengeFilter:
                     min_lat=bounds.get("min_lat"),
                     max_lat=bounds.get("max_lat"),
                 )
-            break
 
     # --- Airport-based: "from X to Y (or back)" ---
-    from_to_match = re.search(
-        r"(?:flight\s+)?(?:going\s+)?from\s+(.+?)\s+to\s+(.+?)(?:\s+or\s+back)?(?:\s+airport)?\.?$",
-        cleaned,
-        re.IGNORECASE,
-    )
+    from_to_match = _RE_FROM_TO.search(cleaned)
     if from_to_match:
         city_a = from_to_match.group(1).strip()
         city_b = from_to_match.group(2).strip()
@@ -567,21 +903,17 @@ def parse_challenge(text: str, models_data: dict) -> ChallengeFilter:
 
     # --- Airport-based ---
     # "flight going to or from X or Y"
-    airport_match = re.search(
-        r"(?:flight\s+)?(?:going\s+)?(?:to|from)\s+(?:or\s+(?:to|from)\s+)?(.+?)(?:\s+airport)?(?:\s+in\s+the\s+world)?\.?$",
-        cleaned,
-        re.IGNORECASE,
-    )
+    airport_match = _RE_TO_OR_FROM.search(cleaned)
     if airport_match:
         airport_text = airport_match.group(1)
         # Handle compound: "the northernmost (Longyearbyen) or southernmost (Ushuai)"
         # Extract parenthetical names first
-        paren_names = re.findall(r"\(([^)]+)\)", airport_text)
+        paren_names = _RE_PAREN.findall(airport_text)
         if paren_names:
             airport_names = paren_names
         else:
             # Split on " or "
-            airport_names = [n.strip() for n in re.split(r"\s+or\s+", airport_text)]
+            airport_names = [n.strip() for n in _RE_OR_SPLIT.split(airport_text)]
 
         icao_codes: Set[str] = set()
         resolved_names = []
@@ -603,11 +935,7 @@ def parse_challenge(text: str, models_data: dict) -> ChallengeFilter:
             )
 
     # --- Rarity tier ---
-    tier_match = re.search(
-        r"\b(ultra|rare|scarce|uncommon|common|historical|fantasy)\b",
-        cleaned,
-        re.IGNORECASE,
-    )
+    tier_match = _RE_TIER.search(cleaned) if "tier" in kw else None
     if tier_match:
         tier_word = tier_match.group(1).lower()
         tier_display = {
@@ -627,14 +955,10 @@ def parse_challenge(text: str, models_data: dict) -> ChallengeFilter:
         )
 
     # --- Aircraft class ---
-    class_match = re.search(
-        r"\b(helicopter|military|gyrocopter|autogyro|tiltrotor|amphibian|glider)\b",
-        cleaned,
-        re.IGNORECASE,
-    )
+    class_match = _RE_CLASS.search(cleaned) if "cls" in kw else None
     if class_match:
         class_name = class_match.group(1).lower()
-        class_codes = _build_class_typecodes(rows)
+        class_codes = _get_class_typecodes(rows)
         codes = class_codes.get(class_name, set())
         return ChallengeFilter(
             challenge_type=ChallengeType.AIRCRAFT_CLASS,
@@ -645,10 +969,10 @@ def parse_challenge(text: str, models_data: dict) -> ChallengeFilter:
 
     # --- Compound "X or Y" for aircraft types ---
     # e.g. "Pilatus PC-12 or PC-24" -> parse each variant separately, merge codes
-    or_match = re.search(r"\s+or\s+", cleaned, re.IGNORECASE)
-    if or_match and not re.search(r"\bback\b", cleaned, re.IGNORECASE):
+    or_match = _RE_OR_SPLIT.search(cleaned)
+    if or_match and not _RE_BACK.search(cleaned):
         # Split on " or " and try to parse each part
-        parts = re.split(r"\s+or\s+", cleaned, flags=re.IGNORECASE)
+        parts = _RE_OR_SPLIT.split(cleaned)
         # For patterns like "Pilatus PC-12 or PC-24", the second part may lack
         # the manufacturer prefix; try to infer it from the first part
         merged_codes: Set[str] = set()
@@ -677,68 +1001,67 @@ def parse_challenge(text: str, models_data: dict) -> ChallengeFilter:
             )
 
     # --- Manufacturer-based ---
-    mfr_index = _build_manufacturer_index(rows)
+    mfr_index = _get_manufacturer_index(rows)
     # Strip trailing "aircraft", "plane", "airplane"
-    mfr_candidate = re.sub(
-        r"\s*(?:aircraft|plane|airplane|aeroplane)s?\s*$",
-        "",
-        cleaned,
-        flags=re.IGNORECASE,
-    ).strip()
+    mfr_candidate = _RE_TRAILING_NOUN.sub("", cleaned).strip()
 
     if mfr_candidate:
         # Try several normalizations
         for key in [
             mfr_candidate.lower(),
-            mfr_candidate.lower().replace("'", "").replace("-", " ").strip(),
-            re.sub(r"[^a-z0-9]", "", mfr_candidate.lower()),
+            mfr_candidate.lower().translate(_STRIP_PUNCT_TABLE).strip(),
+            _collapse_alnum(mfr_candidate.lower()),
         ]:
             if key in mfr_index:
                 canonical, codes = mfr_index[key]
                 return ChallengeFilter(
                     challenge_type=ChallengeType.MANUFACTURER,
                     original_text=original,
-                    description=f"{canonical} aircraft ({len(codes)} types: {', '.join(sorted(codes)[:8])}{'...' if len(codes) > 8 else ''})",
+                    description=f"{canonical} aircraft ({len(codes)} types: {', '.join(heapq.nsmallest(8, codes))}{'...' if len(codes) > 8 else ''})",
                     typecodes=codes,
                 )
 
     # --- Manufacturer + model pattern (e.g. "Boeing 747", "Airbus A380") ---
     # Check if text starts with a known manufacturer followed by a model identifier
-    search_lower = re.sub(
-        r"\s*(?:aircraft|plane|airplane|aeroplane)s?\s*$", "", cleaned, flags=re.IGNORECASE
-    ).strip().lower()
+    search_lower = _RE_TRAILING_NOUN.sub("", cleaned).strip().lower()
     # Also prepare a hyphen-stripped version for matching IDs like "SR22" from "SR-22"
     search_nohyphen = search_lower.replace("-", "")
-    for key, (canonical, mfr_codes) in mfr_index.items():
-        if search_lower.startswith(key) and len(search_lower) > len(key):
-            model_part = search_lower[len(key):].strip()
-            model_nohyphen = model_part.replace("-", "")
-            if model_part:
-                matched_codes: Set[str] = set()
-                for row in rows:
-                    if row.get("id", "") in mfr_codes:
-                        rid = row.get("id", "").lower()
-                        rname = row.get("name", "").lower()
-                        if (model_part in rname or model_part in rid
-                                or model_nohyphen in rid or model_nohyphen in rname):
-                            matched_codes.add(row["id"])
-                if matched_codes:
-                    return ChallengeFilter(
-                        challenge_type=ChallengeType.AIRCRAFT_TYPE,
-                        original_text=original,
-                        description=f"{canonical} {model_part.upper()} variants ({len(matched_codes)} types: {', '.join(sorted(matched_codes)[:8])}{'...' if len(matched_codes) > 8 else ''})",
-                        typecodes=matched_codes,
-                    )
+    prefix_match = _get_mfr_prefix_re(rows).match(search_lower)
+    if prefix_match and len(search_lower) > prefix_match.end(1):
+        key = prefix_match.group(1)
+        canonical, mfr_codes = mfr_index[key]
+        model_part = search_lower[prefix_match.end(1):].strip()
+        model_nohyphen = model_part.replace("-", "")
+        if model_part:
+            matched = _get_models_df(rows).filter(
+                pl.col("id").is_in(mfr_codes)
+                & (
+                    pl.col("name_lower").str.contains(model_part, literal=True)
+                    | pl.col("id_lower").str.contains(model_part, literal=True)
+                    | pl.col("id_lower").str.contains(model_nohyphen, literal=True)
+                    | pl.col("name_lower").str.contains(model_nohyphen, literal=True)
+                )
+            )
+            matched_codes: Set[str] = set(matched["id"].to_list())
+            if matched_codes:
+                return ChallengeFilter(
+                    challenge_type=ChallengeType.AIRCRAFT_TYPE,
+                    original_text=original,
+                    description=f"{canonical} {model_part.upper()} variants ({len(matched_codes)} types: {', '.join(heapq.nsmallest(8, matched_codes))}{'...' if len(matched_codes) > 8 else ''})",
+                    typecodes=matched_codes,
+                )
 
     # --- Aircraft type (specific model search) ---
     # Search model names and IDs for a match (also try without hyphens)
-    matched_codes = set()
-    for row in rows:
-        model_id = row.get("id", "").lower()
-        model_name = row.get("name", "").lower()
-        if (search_lower in model_name or search_lower == model_id
-                or search_nohyphen in model_name or search_nohyphen == model_id):
-            matched_codes.add(row["id"])
+    models_df = _get_models_df(rows)
+    matched_codes = set(
+        models_df.filter(
+            pl.col("name_lower").str.contains(search_lower, literal=True)
+            | (pl.col("id_lower") == search_lower)
+            | pl.col("name_lower").str.contains(search_nohyphen, literal=True)
+            | (pl.col("id_lower") == search_nohyphen)
+        )["id"].to_list()
+    )
 
     if matched_codes:
         return ChallengeFilter(
@@ -751,12 +1074,14 @@ def parse_challenge(text: str, models_data: dict) -> ChallengeFilter:
     # --- Fallback: best-effort broad search ---
     # Try the full phrase against model names, then individual words
     words = [w for w in search_lower.split() if len(w) > 2]
-    for row in rows:
-        name_lower = row.get("name", "").lower()
-        mfr_lower = row.get("manufacturer", "").lower()
-        # Require ALL words to match (not just any)
-        if all(w in name_lower or w in mfr_lower for w in words):
-            matched_codes.add(row["id"])
+    # Require ALL words to match (not just any)
+    word_mask = pl.lit(True)
+    for w in words:
+        word_mask = word_mask & (
+            pl.col("name_lower").str.contains(w, literal=True)
+            | pl.col("mfr_lower").str.contains(w, literal=True)
+        )
+    matched_codes.update(models_df.filter(word_mask)["id"].to_list())
     if matched_codes:
         return ChallengeFilter(
             challenge_type=ChallengeType.AIRCRAFT_TYPE,
@@ -783,132 +1108,189 @@ def _get_region(code: str) -> Optional[str]:
     return _get_region_for_iata(code) if code else None
 
 
-def filter_flights_for_challenge(
-    flights_df: pl.DataFrame,
-    challenge: ChallengeFilter,
-) -> pl.DataFrame:
-    """Filter enriched flights DataFrame to those matching a challenge."""
-    if len(flights_df) == 0:
-        return flights_df
-
-    ct = challenge.challenge_type
-
-    if ct in (ChallengeType.MANUFACTURER, ChallengeType.AIRCRAFT_TYPE, ChallengeType.AIRCRAFT_CLASS):
-        if not challenge.typecodes:
-            return flights_df.head(0)  # empty
-        return flights_df.filter(pl.col("typecode").is_in(challenge.typecodes))
-
-    if ct == ChallengeType.AIRPORT:
-        if not challenge.airport_icao:
-            return flights_df.head(0)
-        # FR24 data uses IATA codes (e.g. "SYD"), but challenge resolution
-        # produces ICAO codes (e.g. "YSSY"). Include both formats for matching.
-        icao_to_iata = {v: k for k, v in IATA_TO_ICAO.items()}
-        codes = set(challenge.airport_icao)
-        for icao in challenge.airport_icao:
-            iata = icao_to_iata.get(icao)
-            if iata:
-                codes.add(iata)
-        return flights_df.filter(
-            pl.col("origin").is_in(codes) | pl.col("destination").is_in(codes)
-        )
+# Inverse of the frozen region mapping: region -> frozenset of IATA
+# codes. A flight's origin region is in side_a exactly when its origin
+# code is in side_a's code set, so ROUTE filtering needs no region
+# derivation at all — just membership against these sets.
+_REGION_TO_CODES: Dict[str, FrozenSet[str]] = {}
+for _code, _region in IATA_REGIONS.items():
+    _REGION_TO_CODES.setdefault(_region, set()).add(_code)  # type: ignore[arg-type]
+_REGION_TO_CODES = {r: frozenset(s) for r, s in _REGION_TO_CODES.items()}
+del _code, _region
 
-    if ct == ChallengeType.AIRPORT_PAIR:
-        if not challenge.origin_codes or not challenge.destination_codes:
-            return flights_df.head(0)
-        a = challenge.origin_codes
-        b = challenge.destination_codes
-        return flights_df.filter(
-            (pl.col("origin").is_in(a) & pl.col("destination").is_in(b))
-            | (pl.col("origin").is_in(b) & pl.col("destination").is_in(a))
-        )
 
-    if ct == ChallengeType.ROUTE:
-        route_def = ROUTE_DEFINITIONS.get(challenge.route_name)
-        if not route_def:
-            return flights_df.head(0)
-
-        side_a = route_def["side_a"]
-        side_b = route_def["side_b"]
-
-        # Build region lookup for all unique origin/destination IATA codes
-        _build_iata_regions()
-        all_codes = set()
-        for col in ["origin", "destination"]:
-            if col in flights_df.columns:
-                codes = flights_df.select(pl.col(col)).filter(pl.col(col) != "").unique()
-                all_codes.update(codes.to_series().to_list())
-
-        # Build IATA -> region mapping DataFrame
-        code_region_pairs = []
-        for code in all_codes:
-            region = _get_region(code)
-            if region:
-                code_region_pairs.append((code, region))
+@functools.lru_cache(maxsize=None)
+def _route_side_code_sets(route_name: str) -> Optional[Tuple[FrozenSet[str], FrozenSet[str]]]:
+    """Resolve a route's side regions to frozen code sets, once per route."""
+    route_def = ROUTE_DEFINITIONS.get(route_name)
+    if not route_def:
+        return None
 
-        if not code_region_pairs:
-            return flights_df.head(0)
+    def _codes(regions: FrozenSet[str]) -> FrozenSet[str]:
+        out: Set[str] = set()
+        for region in regions:
+            out |= _REGION_TO_CODES.get(region, frozenset())
+        return frozenset(out)
 
-        region_df = pl.DataFrame({
-            "code": [p[0] for p in code_region_pairs],
-            "region": [p[1] for p in code_region_pairs],
-        })
+    return _codes(route_def["side_a"]), _codes(route_def["side_b"])
 
-        # Join origin and destination regions
-        df = flights_df.join(
-            region_df.rename({"code": "origin", "region": "_o_region"}),
-            on="origin", how="left",
-        )
-        df = df.join(
-            region_df.rename({"code": "destination", "region": "_d_region"}),
-            on="destination", how="left",
-        )
 
-        # Filter: origin in side_a & dest in side_b, OR vice versa
-        mask = (
-            (pl.col("_o_region").is_in(side_a) & pl.col("_d_region").is_in(side_b))
-            | (pl.col("_o_region").is_in(side_b) & pl.col("_d_region").is_in(side_a))
+def _filter_typecodes(flights_lf: pl.LazyFrame, challenge: ChallengeFilter) -> pl.LazyFrame:
+    if not challenge.typecodes:
+        return flights_lf.clear()  # empty
+    return flights_lf.filter(pl.col("typecode").is_in(challenge.typecode_series()))
+
+
+def _filter_airport(flights_lf: pl.LazyFrame, challenge: ChallengeFilter) -> pl.LazyFrame:
+    if not challenge.airport_icao:
+        return flights_lf.clear()
+    codes = challenge.airport_code_series()
+    return flights_lf.filter(
+        pl.col("origin").is_in(codes) | pl.col("destination").is_in(codes)
+    )
+
+
+def _filter_airport_pair(flights_lf: pl.LazyFrame, challenge: ChallengeFilter) -> pl.LazyFrame:
+    if not challenge.origin_codes or not challenge.destination_codes:
+        return flights_lf.clear()
+    pairs = challenge.pair_series()
+    if pairs is not None:
+        # One membership scan on a fused pair key instead of four
+        # is_in kernels plus three boolean combinators
+        return flights_lf.filter(
+            (pl.col("origin") + "|" + pl.col("destination")).is_in(pairs)
         )
-        result = df.filter(mask).drop(["_o_region", "_d_region"])
-        return result
+    a = challenge.origin_series()
+    b = challenge.destination_series()
+    return flights_lf.filter(
+        (pl.col("origin").is_in(a) & pl.col("destination").is_in(b))
+        | (pl.col("origin").is_in(b) & pl.col("destination").is_in(a))
+    )
 
-    if ct == ChallengeType.LATITUDE_REGION:
-        mask = pl.lit(True)
-        if challenge.min_lat is not None:
-            mask = mask & (pl.col("latitude") >= challenge.min_lat)
-        if challenge.max_lat is not None:
-            mask = mask & (pl.col("latitude") <= challenge.max_lat)
-        return flights_df.filter(mask)
 
-    if ct == ChallengeType.RARITY_TIER:
-        if not challenge.tier:
-            return flights_df.head(0)
-        return flights_df.filter(pl.col("tier") == challenge.tier)
+def _filter_route(flights_lf: pl.LazyFrame, challenge: ChallengeFilter) -> pl.LazyFrame:
+    if not challenge.origin_codes or not challenge.destination_codes:
+        # Challenges parsed before the side sets were preresolved
+        sides = _route_side_code_sets(challenge.route_name) if challenge.route_name else None
+        if sides is None:
+            return flights_lf.clear()
+        challenge.origin_codes, challenge.destination_codes = sides
+    schema_cols = flights_lf.collect_schema().names()
+    if "origin" not in schema_cols or "destination" not in schema_cols:
+        return flights_lf.clear()
+    # Side sets preresolved at parse time: same bidirectional match as an
+    # airport pair, including the fused pair-key fast path when small
+    return _filter_airport_pair(flights_lf, challenge)
+
+
+def _filter_latitude(flights_lf: pl.LazyFrame, challenge: ChallengeFilter) -> pl.LazyFrame:
+    min_lat, max_lat = challenge.min_lat, challenge.max_lat
+    if min_lat is None and max_lat is None:
+        # No bounds at all — everything matches, skip the no-op filter
+        return flights_lf
+    if min_lat is None:
+        return flights_lf.filter(pl.col("latitude") <= max_lat)
+    if max_lat is None:
+        return flights_lf.filter(pl.col("latitude") >= min_lat)
+    # Both bounds: is_between runs as one fused kernel
+    return flights_lf.filter(pl.col("latitude").is_between(min_lat, max_lat))
+
+
+def _filter_tier(flights_lf: pl.LazyFrame, challenge: ChallengeFilter) -> pl.LazyFrame:
+    if not challenge.tier:
+        return flights_lf.clear()
+    return flights_lf.filter(pl.col("tier") == challenge.tier)
+
+
+# Dispatch table: one dict lookup instead of walking an if/elif chain,
+# and each branch is a small handler new challenge types can slot into
+_FILTER_HANDLERS: Dict[ChallengeType, Callable[[pl.LazyFrame, ChallengeFilter], pl.LazyFrame]] = {
+    ChallengeType.MANUFACTURER: _filter_typecodes,
+    ChallengeType.AIRCRAFT_TYPE: _filter_typecodes,
+    ChallengeType.AIRCRAFT_CLASS: _filter_typecodes,
+    ChallengeType.AIRPORT: _filter_airport,
+    ChallengeType.AIRPORT_PAIR: _filter_airport_pair,
+    ChallengeType.ROUTE: _filter_route,
+    ChallengeType.LATITUDE_REGION: _filter_latitude,
+    ChallengeType.RARITY_TIER: _filter_tier,
+}
 
-    return flights_df.head(0)
+
+def filter_flights_for_challenge(
+    flights_lf: pl.LazyFrame,
+    challenge: ChallengeFilter,
+) -> pl.LazyFrame:
+    """Build the lazy filter plan matching a challenge against enriched flights.
+
+    Takes and returns a LazyFrame so the Polars optimizer can push the
+    membership predicates and region joins into the scan, and so callers
+    can batch several challenge plans into one collect.
+    """
+    handler = _FILTER_HANDLERS.get(challenge.challenge_type)
+    if handler is None:
+        return flights_lf.clear()
+    return handler(flights_lf, challenge)
 
 
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
 
+@functools.lru_cache(maxsize=1)
+def _models_for_version(models_version: str) -> dict:
+    """Pin one models_data dict per version string.
+
+    Cache misses within a batch then share the same rows list, so the
+    id()-keyed index caches above are built once, not once per miss.
+    """
+    return get_models()
+
+
+@functools.lru_cache(maxsize=512)
+def parse_challenge_cached(text: str, models_version: str) -> ChallengeFilter:
+    """Memoized :func:`parse_challenge`.
+
+    Daily challenge texts recur across refreshes and users, and parsing is
+    pure given (text, models version), so repeats are a dict hit. Pass the
+    models ``updatedAt`` stamp as ``models_version``; a new models drop
+    naturally invalidates old entries by keying them out.
+    """
+    return parse_challenge(text, _models_for_version(models_version))
+
+
 def parse_challenges(challenge_texts: List[str]) -> List[ChallengeFilter]:
     """Parse a list of challenge text strings into ChallengeFilter objects."""
-    models_data = get_models()
-    return [parse_challenge(text, models_data) for text in challenge_texts]
+    version = str(get_models().get("updatedAt", ""))
+    return [parse_challenge_cached(text, version) for text in challenge_texts]
 
 
 def run_challenges(
     flights_df: pl.DataFrame,
     challenges: List[ChallengeFilter],
+    top_k: Optional[int] = None,
 ) -> List[Tuple[ChallengeFilter, pl.DataFrame]]:
     """Run all challenges against enriched flight data.
 
-    Returns list of (challenge, matching_flights_df) tuples.
+    Returns list of (challenge, matching_flights_df) tuples, each sorted
+    by rarity descending. Callers that only consume the K rarest matches
+    per challenge can pass ``top_k`` to replace the full sort with a heap
+    select (O(N log K) instead of O(N log N)).
     """
-    results = []
-    for ch in challenges:
-        matches = filter_flights_for_challenge(flights_df, ch)
-        matches = matches.sort("rarity", descending=True)
-        results.append((ch, matches))
-    return results
+    lf = flights_df.lazy()
+
+    def _ranked(plan: pl.LazyFrame) -> pl.LazyFrame:
+        if top_k is not None:
+            # top_k doesn't guarantee output order; sorting K rows is cheap
+            return plan.top_k(top_k, by="rarity").sort("rarity", descending=True)
+        return plan.sort("rarity", descending=True)
+
+    plans = [
+        _ranked(filter_flights_for_challenge(lf, ch)) for ch in challenges
+    ]
+    # One collect for all plans: they run in parallel on the Polars
+    # threadpool, and common-subplan elimination (on by default) shares
+    # the flights scan across challenges. The streaming engine processes
+    # each plan in batches, keeping peak memory at a batch size even when
+    # a branch (e.g. ROUTE enrichment) widens the working set.
+    collected = pl.collect_all(plans, engine="streaming")
+    return list(zip(challenges, collected))
@@ -3,17 +3,94 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import os
+import threading
 from typing import Optional, Tuple
 
 import polars as pl
 from fr24 import FR24, BBOXES_WORLD_STATIC, BoundingBox
 
-
-async def _fetch_bbox(client, bbox: BoundingBox) -> Optional[pl.DataFrame]:
+# Number of independent FR24 clients (one HTTP/2 channel each) used for the
+# worldwide fan-out. Spreading the 26 bbox requests across a few connections
+# avoids head-of-line blocking on a single multiplexed TCP socket.
+POOL_SIZE = int(os.getenv("SKYCARDS_FR24_POOL", "4"))
+
+# Cap on simultaneous in-flight bbox requests. Firing all 26 at once trips
+# FR24's per-client rate limit, which surfaces as "transient" bbox failures.
+MAX_INFLIGHT = int(os.getenv("SKYCARDS_FR24_INFLIGHT", "8"))
+
+# Columns actually consumed downstream (rarity join, terminal table, map).
+# Projecting right after to_polars keeps the concat/dedup buffers narrow —
+# fr24 returns 17 columns, most of which (eta, squawk, on_ground, ...) are
+# never read.
+_WANTED_COLS = [
+    "flightid",
+    "latitude",
+    "longitude",
+    "track",
+    "altitude",
+    "ground_speed",
+    "callsign",
+    "registration",
+    "origin",
+    "destination",
+    "typecode",
+]
+
+# Shared FR24 client for single-bbox fetches, reused across refreshes so
+# server mode doesn't pay the TLS + HTTP/2 connection setup on every call.
+# Cached per event loop: a client's connections are bound to the loop that
+# opened them, so a fresh loop (e.g. a one-shot CLI run) gets a fresh client.
+_client: Optional[FR24] = None
+_client_loop = None
+_client_lock = asyncio.Lock()
+
+# Shared pool for the worldwide fan-out, cached the same way
+_pool: Optional[list] = None
+_pool_loop = None
+
+
+async def _get_client() -> FR24:
+    """Return the shared FR24 client, opening it lazily on first use."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    async with _client_lock:
+        if _client is None or _client_loop is not loop:
+            # A previous loop's client can't be closed from here; its
+            # transports died with that loop, so just drop the reference
+            client = FR24()
+            await client.__aenter__()
+            _client = client
+            _client_loop = loop
+    return _client
+
+
+async def _get_pool() -> list:
+    """Return the shared pool of FR24 clients for worldwide fetches."""
+    global _pool, _pool_loop
+    loop = asyncio.get_running_loop()
+    async with _client_lock:
+        if _pool is None or _pool_loop is not loop:
+            pool_size = max(1, min(POOL_SIZE, len(BBOXES_WORLD_STATIC)))
+            pool = []
+            for _ in range(pool_size):
+                client = FR24()
+                await client.__aenter__()
+                pool.append(client)
+            _pool = pool
+            _pool_loop = loop
+    return _pool
+
+
+async def _fetch_bbox(
+    client, bbox: BoundingBox, sem: Optional[asyncio.Semaphore] = None
+) -> Optional[pl.DataFrame]:
     """Fetch flights for a single bounding box, returning None on failure."""
     try:
-        result = await client.live_feed.fetch(bounding_box=bbox)
-        return result.to_polars()
+        async with sem if sem is not None else contextlib.nullcontext():
+            result = await client.live_feed.fetch(bounding_box=bbox)
+        return result.to_polars().select(_WANTED_COLS)
     except Exception as e:
         # Log but don't crash — some regions may have transient errors
         print(f"  Warning: failed to fetch bbox {bbox}: {e}")
@@ -29,27 +106,77 @@ async def _fetch_all_flights(
     (FR24 limits each query to 1500 flights).
 
     Returns a polars DataFrame with columns:
-        timestamp, flightid, latitude, longitude, track, altitude,
-        ground_speed, on_ground, callsign, source, registration,
-        origin, destination, typecode, eta, squawk, vertical_speed
+        flightid, latitude, longitude, track, altitude, ground_speed,
+        callsign, registration, origin, destination, typecode
     """
-    async with FR24() as client:
-        if bbox is not None:
-            result = await client.live_feed.fetch(bounding_box=bbox)
-            return result.to_polars()
+    if bbox is not None:
+        client = await _get_client()
+        result = await client.live_feed.fetch(bounding_box=bbox)
+        return result.to_polars().select(_WANTED_COLS)
+
+    # Worldwide: fetch all bounding boxes concurrently, round-robined across
+    # a small pool of clients so requests don't share one connection's cwnd
+    clients = await _get_pool()
+    sem = asyncio.Semaphore(max(1, MAX_INFLIGHT))
+    results = await asyncio.gather(
+        *[
+            _fetch_bbox(clients[i % len(clients)], world_bbox, sem)
+            for i, world_bbox in enumerate(BBOXES_WORLD_STATIC)
+        ]
+    )
+    frames = [df for df in results if df is not None and not df.is_empty()]
+
+    if not frames:
+        return pl.DataFrame()
+
+    # Concatenate and deduplicate by flight ID lazily so Polars fuses
+    # both steps into one streaming pass instead of materializing the
+    # full ~39k-row concat before dedup
+    return (
+        pl.concat([df.lazy() for df in frames])
+        .unique(subset=["flightid"], keep="first")
+        .collect(engine="streaming")
+    )
+
+
+async def fetch_live_flights_async(
+    bounds: Optional[Tuple[float, float, float, float]] = None,
+) -> pl.DataFrame:
+    """Fetch live flights from inside an existing event loop.
 
-        # Worldwide: fetch all bounding boxes concurrently
-        results = await asyncio.gather(
-            *[_fetch_bbox(client, world_bbox) for world_bbox in BBOXES_WORLD_STATIC]
-        )
-        frames = [df for df in results if df is not None and len(df) > 0]
+    Callers that already run a loop (e.g. a server refresh task) should use
+    this directly so each fetch reuses the shared clients instead of paying
+    for a new loop + connection setup via :func:`fetch_live_flights`.
 
-        if not frames:
-            return pl.DataFrame()
+    Args:
+        bounds: Optional (south, north, west, east) bounding box.
+                If None, fetches worldwide.
+
+    Returns:
+        polars DataFrame of live flights.
+    """
+    bbox = BoundingBox(*bounds) if bounds else None
+    return await _fetch_all_flights(bbox)
 
-        # Concatenate and deduplicate by flight ID
-        combined = pl.concat(frames)
-        return combined.unique(subset=["flightid"])
+
+# Dedicated background event loop for the sync wrapper. Created lazily on
+# first use and kept alive on a daemon thread, so repeated sync calls skip
+# asyncio.run's loop setup/teardown and keep hitting the shared clients.
+_sync_loop: Optional[asyncio.AbstractEventLoop] = None
+_sync_loop_lock = threading.Lock()
+
+
+def _get_sync_loop() -> asyncio.AbstractEventLoop:
+    """Return the lazily-started background loop for sync fetches."""
+    global _sync_loop
+    with _sync_loop_lock:
+        if _sync_loop is None or _sync_loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="fr24-loop", daemon=True
+            ).start()
+            _sync_loop = loop
+    return _sync_loop
 
 
 def fetch_live_flights(
@@ -64,5 +191,7 @@ def fetch_live_flights(
     Returns:
         polars DataFrame of live flights.
     """
-    bbox = BoundingBox(*bounds) if bounds else None
-    return asyncio.run(_fetch_all_flights(bbox))
+    future = asyncio.run_coroutine_threadsafe(
+        fetch_live_flights_async(bounds), _get_sync_loop()
+    )
+    return future.result()
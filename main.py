@@ -87,10 +87,72 @@ TIER_COLORS = {
 }
 
 
-def _print_challenge_table(console: Console, challenge, matches_df) -> None:
-    """Print a rich table for a single challenge's matching flights."""
+def _prepare_display_rows(df, limit: int) -> list:
+    """Coalesce nulls and pre-format display strings in Polars.
+
+    Does the per-row null fallbacks, tier styling, and position/route/
+    aircraft formatting as vectorized column expressions, so the Rich loop
+    only calls add_row.
+    """
     import polars as pl
 
+    tier_style_df = pl.DataFrame(
+        {"tier": list(TIER_COLORS), "style": list(TIER_COLORS.values())}
+    )
+
+    return (
+        df.head(limit)
+        .with_columns(
+            pl.col("tier").fill_null(""),
+            pl.col("typecode").fill_null(""),
+            pl.col("aircraft_name").fill_null(pl.col("typecode")).fill_null(""),
+            pl.col("xp").fill_null(0),
+            pl.col("altitude").fill_null(0),
+            pl.col("latitude").fill_null(0.0),
+            pl.col("longitude").fill_null(0.0),
+            pl.col("origin").fill_null(""),
+            pl.col("destination").fill_null(""),
+            pl.when(
+                pl.col("registration").is_null() | (pl.col("registration") == "")
+            )
+            .then(pl.lit("—"))
+            .otherwise(pl.col("registration"))
+            .alias("registration"),
+        )
+        .with_columns(
+            pl.format(
+                "{}, {}", pl.col("latitude").round(1), pl.col("longitude").round(1)
+            ).alias("pos"),
+            pl.when((pl.col("origin") != "") & (pl.col("destination") != ""))
+            .then(pl.format("{}→{}", pl.col("origin"), pl.col("destination")))
+            .when(pl.col("origin") != "")
+            .then(pl.col("origin"))
+            .when(pl.col("destination") != "")
+            .then(pl.col("destination"))
+            .otherwise(pl.lit("—"))
+            .alias("route"),
+            pl.when(pl.col("aircraft_name") != pl.col("typecode"))
+            .then(pl.format("{} ({})", pl.col("aircraft_name"), pl.col("typecode")))
+            .otherwise(pl.col("typecode"))
+            .alias("aircraft_display"),
+        )
+        .join(tier_style_df, on="tier", how="left")
+        .with_columns(
+            pl.when(pl.col("style").is_not_null())
+            .then(
+                pl.format(
+                    "[{}]{}[/{}]", pl.col("style"), pl.col("tier"), pl.col("style")
+                )
+            )
+            .otherwise(pl.col("tier"))
+            .alias("tier_display"),
+        )
+        .to_dicts()
+    )
+
+
+def _print_challenge_table(console: Console, challenge, matches_df) -> None:
+    """Print a rich table for a single challenge's matching flights."""
     count = len(matches_df)
     if count == 0:
         console.print(
@@ -112,31 +174,15 @@ def _print_challenge_table(console: Console, challenge, matches_df) -> None:
     table.add_column("Route")
     table.add_column("Position")
 
-    for row in matches_df.head(25).iter_rows(named=True):
-        rarity = row["rarity"]
-        tier = row.get("tier", "")
-        aircraft = row.get("aircraft_name", row.get("typecode", "")) or ""
-        typecode = row.get("typecode", "") or ""
-        xp = row.get("xp", 0) or 0
-        reg = row.get("registration", "") or "—"
-        lat = row.get("latitude", 0) or 0
-        lon = row.get("longitude", 0) or 0
-        origin = row.get("origin", "") or ""
-        destination = row.get("destination", "") or ""
-
-        pos = f"{lat:.1f}, {lon:.1f}"
-        route = f"{origin}→{destination}" if origin and destination else origin or destination or "—"
-        tier_style = TIER_COLORS.get(tier, "")
-        aircraft_display = f"{aircraft} ({typecode})" if aircraft != typecode else typecode
-
+    for row in _prepare_display_rows(matches_df, 25):
         table.add_row(
-            f"{rarity:.2f}",
-            f"[{tier_style}]{tier}[/{tier_style}]" if tier_style else tier,
-            aircraft_display,
-            f"{xp:,}",
-            reg,
-            route,
-            pos,
+            f"{row['rarity']:.2f}",
+            row["tier_display"],
+            row["aircraft_display"],
+            f"{row['xp']:,}",
+            row["registration"],
+            row["route"],
+            row["pos"],
         )
 
     console.print(table)
@@ -180,7 +226,7 @@ def _run_challenge_mode(
 
     # Generate map with all challenge matches combined
     if not args.no_map:
-        all_frames = [df for _, df in results if len(df) > 0]
+        all_frames = [df for _, df in results if not df.is_empty()]
         if all_frames:
             all_matches = pl.concat(all_frames).unique(subset=["flightid"])
             map_path = generate_map(all_matches, args.output)
@@ -324,45 +370,18 @@ def main() -> None:
     table.add_column("Alt", justify="right")
     table.add_column("Route")
 
-    tier_colors = {
-        "Ultra": "bold red",
-        "Historical": "bold magenta",
-        "Fantasy": "bold magenta",
-        "Rare": "bold yellow",
-        "Scarce": "bold green",
-        "Uncommon": "blue",
-        "Common": "dim",
-    }
-
-    for row in rare_df.head(100).iter_rows(named=True):
-        rarity = row["rarity"]
-        tier = row.get("tier", "")
-        aircraft = row.get("aircraft_name", row.get("typecode", "")) or ""
-        typecode = row.get("typecode", "") or ""
-        xp = row.get("xp", 0) or 0
-        reg = row.get("registration", "") or "—"
-        lat = row.get("latitude", 0) or 0
-        lon = row.get("longitude", 0) or 0
-        alt = row.get("altitude", 0) or 0
-        origin = row.get("origin", "") or ""
-        destination = row.get("destination", "") or ""
-
-        pos = f"{lat:.1f}, {lon:.1f}"
-        route = f"{origin}→{destination}" if origin and destination else origin or destination or "—"
-        tier_style = tier_colors.get(tier, "")
-
-        # Show aircraft name with typecode
-        aircraft_display = f"{aircraft} ({typecode})" if aircraft != typecode else typecode
+    for row in _prepare_display_rows(rare_df, 100):
+        alt = row["altitude"]
 
         table.add_row(
-            f"{rarity:.2f}",
-            f"[{tier_style}]{tier}[/{tier_style}]" if tier_style else tier,
-            aircraft_display,
-            f"{xp:,}",
-            reg,
-            pos,
+            f"{row['rarity']:.2f}",
+            row["tier_display"],
+            row["aircraft_display"],
+            f"{row['xp']:,}",
+            row["registration"],
+            row["pos"],
             f"{alt:,}" if alt else "—",
-            route,
+            row["route"],
         )
 
     console.print(table)
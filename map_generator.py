@@ -13,27 +13,63 @@ import folium
 import polars as pl
 
 
-def _get_marker_color(rarity: float) -> str:
-    """Get marker color based on Skycards rarity tiers."""
-    if rarity >= 10.0:
-        return "darkred"
-    elif rarity >= 8.0:
-        return "red"
-    elif rarity >= 6.0:
-        return "orange"
-    elif rarity >= 4.0:
-        return "green"
-    elif rarity >= 2.0:
-        return "blue"
-    else:
-        return "gray"
+# Map from rarity score to Leaflet awesome-markers color name
+_COLOR_MAP = [
+    (10.0, "darkred"),
+    (8.0, "red"),
+    (6.0, "orange"),
+    (4.0, "green"),
+    (2.0, "blue"),
+    (0.0, "gray"),
+]
 
+# Map from rarity score to FontAwesome icon name
+_ICON_MAP = [(8.0, "star"), (0.0, "plane")]
 
-def _get_marker_icon(rarity: float) -> str:
-    """Get FontAwesome icon based on rarity."""
-    if rarity >= 8.0:
-        return "star"
-    return "plane"
+
+def _threshold_expr(mapping: list, col: str = "rarity") -> pl.Expr:
+    """Map a numeric column through a (threshold, value) table.
+
+    Uses a single binned `cut` (binary search per value) rather than a
+    chain of dependent >= masks, so the whole column is classified in one
+    branchless pass.
+    """
+    breaks = [threshold for threshold, _ in reversed(mapping[:-1])]
+    labels = [value for _, value in reversed(mapping)]
+    return (
+        pl.col(col).cut(breaks=breaks, labels=labels, left_closed=True).cast(pl.String)
+    )
+
+
+def _fixed2_expr(col: str) -> pl.Expr:
+    """Format a float column with exactly two decimals (vectorized f"{x:.2f}")."""
+    cents = (pl.col(col) * 100).round(0).cast(pl.Int64)
+    return pl.format(
+        "{}.{}",
+        cents // 100,
+        (cents % 100).cast(pl.Utf8).str.pad_start(2, "0"),
+    )
+
+
+def _thousands_expr(col: str) -> pl.Expr:
+    """Format an integer column with comma separators (vectorized f"{n:,}").
+
+    The Rust regex engine has no lookahead, so group from the right by
+    reversing, inserting a comma after every third digit, and reversing back.
+    Formats the absolute value and re-prepends the sign, since a leading
+    '-' would otherwise shield a trailing comma in the reversed string
+    (-123 -> "-,123").
+    """
+    n = pl.col(col).cast(pl.Int64)
+    digits = (
+        n.abs()
+        .cast(pl.Utf8)
+        .str.reverse()
+        .str.replace_all(r"(\d{3})", "${1},")
+        .str.strip_chars_end(",")
+        .str.reverse()
+    )
+    return pl.when(n < 0).then(pl.format("-{}", digits)).otherwise(digits)
 
 
 def generate_map(
@@ -53,7 +89,7 @@ def generate_map(
     Returns:
         Absolute path to the generated HTML file.
     """
-    if len(flights_df) == 0:
+    if flights_df.is_empty():
         print("No flights to map.")
         return output_path
 
@@ -65,7 +101,7 @@ def generate_map(
         & (pl.col("longitude") != 0)
     )
 
-    if len(df) == 0:
+    if df.is_empty():
         print("No flights with valid positions to map.")
         return output_path
 
@@ -79,59 +115,116 @@ def generate_map(
         tiles="CartoDB dark_matter",
     )
 
-    # Add each flight as a marker
-    for row in df.iter_rows(named=True):
-        lat = row["latitude"]
-        lon = row["longitude"]
-        rarity = row.get("rarity", 0)
-        tier = row.get("tier", "Unknown")
-        typecode = row.get("typecode", "")
-        aircraft_name = row.get("aircraft_name", typecode) or typecode
-        xp = row.get("xp", 0) or 0
-        reg = row.get("registration", "") or ""
-        callsign = row.get("callsign", "") or ""
-        altitude = row.get("altitude", 0) or 0
-        speed = row.get("ground_speed", 0) or 0
-        origin = row.get("origin", "") or ""
-        destination = row.get("destination", "") or ""
-
-        route = f"{origin} → {destination}" if origin and destination else origin or destination or "—"
-        fr24_url = f"https://www.flightradar24.com/{callsign}" if callsign else ""
-
-        popup_html = f"""
+    # Build all markers as one JSON payload injected into a single script
+    # block. Per-marker folium.Marker objects each render a Jinja2 template
+    # fragment, which dominates save time for thousands of flights. Popup
+    # HTML and tooltips are assembled with pl.format in a single columnar
+    # string-kernel pass instead of an f-string per row.
+    popup_template = """
         <div style="font-family: Arial, sans-serif; min-width: 220px;">
-            <h4 style="margin: 0 0 8px 0; color: #333;">{aircraft_name}</h4>
+            <h4 style="margin: 0 0 8px 0; color: #333;">{}</h4>
             <table style="font-size: 13px; border-collapse: collapse;">
                 <tr><td style="padding: 2px 8px 2px 0; color: #666;"><b>Rarity</b></td>
-                    <td><b>{rarity:.2f}</b> ({tier})</td></tr>
+                    <td><b>{}</b> ({})</td></tr>
                 <tr><td style="padding: 2px 8px 2px 0; color: #666;"><b>XP</b></td>
-                    <td>{xp:,}</td></tr>
+                    <td>{}</td></tr>
                 <tr><td style="padding: 2px 8px 2px 0; color: #666;"><b>Type</b></td>
-                    <td>{typecode}</td></tr>
+                    <td>{}</td></tr>
                 <tr><td style="padding: 2px 8px 2px 0; color: #666;"><b>Reg</b></td>
-                    <td>{reg}</td></tr>
+                    <td>{}</td></tr>
                 <tr><td style="padding: 2px 8px 2px 0; color: #666;"><b>Callsign</b></td>
-                    <td>{callsign}</td></tr>
+                    <td>{}</td></tr>
                 <tr><td style="padding: 2px 8px 2px 0; color: #666;"><b>Route</b></td>
-                    <td>{route}</td></tr>
+                    <td>{}</td></tr>
                 <tr><td style="padding: 2px 8px 2px 0; color: #666;"><b>Altitude</b></td>
-                    <td>{altitude:,} ft</td></tr>
+                    <td>{} ft</td></tr>
                 <tr><td style="padding: 2px 8px 2px 0; color: #666;"><b>Speed</b></td>
-                    <td>{speed} kts</td></tr>
+                    <td>{} kts</td></tr>
             </table>
-            {"<a href='" + fr24_url + "' target='_blank' style='display:block;margin-top:8px;'>View on FlightRadar24</a>" if fr24_url else ""}
+            {}
         </div>
         """
 
-        color = _get_marker_color(rarity)
-        icon = _get_marker_icon(rarity)
+    markers = (
+        df.with_columns(
+            pl.col("rarity").fill_null(0.0),
+            pl.col("tier").fill_null("Unknown"),
+            pl.col("typecode").fill_null(""),
+            pl.col("xp").fill_null(0),
+            pl.col("registration").fill_null(""),
+            pl.col("callsign").fill_null(""),
+            pl.col("altitude").fill_null(0),
+            pl.col("ground_speed").fill_null(0),
+            pl.col("origin").fill_null(""),
+            pl.col("destination").fill_null(""),
+        )
+        .with_columns(
+            pl.col("aircraft_name").fill_null(pl.col("typecode")),
+            _fixed2_expr("rarity").alias("_rarity_str"),
+            _thousands_expr("xp").alias("_xp_str"),
+            _thousands_expr("altitude").alias("_alt_str"),
+            pl.when((pl.col("origin") != "") & (pl.col("destination") != ""))
+            .then(pl.format("{} → {}", pl.col("origin"), pl.col("destination")))
+            .when(pl.col("origin") != "")
+            .then(pl.col("origin"))
+            .when(pl.col("destination") != "")
+            .then(pl.col("destination"))
+            .otherwise(pl.lit("—"))
+            .alias("_route"),
+            pl.when(pl.col("callsign") != "")
+            .then(
+                pl.format(
+                    "<a href='https://www.flightradar24.com/{}' target='_blank' "
+                    "style='display:block;margin-top:8px;'>View on FlightRadar24</a>",
+                    pl.col("callsign"),
+                )
+            )
+            .otherwise(pl.lit(""))
+            .alias("_fr24_link"),
+        )
+        .select(
+            pl.col("latitude").alias("lat"),
+            pl.col("longitude").alias("lon"),
+            pl.format(
+                popup_template,
+                pl.col("aircraft_name"),
+                pl.col("_rarity_str"),
+                pl.col("tier"),
+                pl.col("_xp_str"),
+                pl.col("typecode"),
+                pl.col("registration"),
+                pl.col("callsign"),
+                pl.col("_route"),
+                pl.col("_alt_str"),
+                pl.col("ground_speed"),
+                pl.col("_fr24_link"),
+            ).alias("popup"),
+            pl.format(
+                "{} | {} ({}) | {} XP",
+                pl.col("aircraft_name"),
+                pl.col("_rarity_str"),
+                pl.col("tier"),
+                pl.col("_xp_str"),
+            ).alias("tooltip"),
+            _threshold_expr(_COLOR_MAP).alias("color"),
+            _threshold_expr(_ICON_MAP).alias("icon"),
+        )
+        .to_dicts()
+    )
 
-        folium.Marker(
-            location=[lat, lon],
-            popup=folium.Popup(popup_html, max_width=300),
-            tooltip=f"{aircraft_name} | {rarity:.2f} ({tier}) | {xp:,} XP",
-            icon=folium.Icon(color=color, icon=icon, prefix="fa"),
-        ).add_to(m)
+    marker_js = f"""
+    var flightMarkers = {json.dumps(markers)};
+    var markerGroup = L.featureGroup();
+    flightMarkers.forEach(function(f) {{
+        L.marker([f.lat, f.lon], {{
+            icon: L.AwesomeMarkers.icon({{
+                icon: f.icon, prefix: 'fa', markerColor: f.color
+            }})
+        }}).bindPopup(f.popup, {{maxWidth: 300}}).bindTooltip(f.tooltip).addTo(markerGroup);
+    }});
+    markerGroup.addTo({m.get_name()});
+    """
+    m.get_root().script.add_child(folium.Element(marker_js))
 
     # Legend matching Skycards tiers
     legend_html = """
@@ -151,8 +244,15 @@ def generate_map(
     """
     m.get_root().html.add_child(folium.Element(legend_html))
 
+    # Render to a string and swap into place atomically — one write syscall
+    # instead of m.save's incremental writes, and repeated saves (server
+    # mode) never expose a half-written file to an open browser tab
     abs_path = os.path.abspath(output_path)
-    m.save(abs_path)
+    html = m.get_root().render()
+    tmp_path = abs_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(html)
+    os.replace(tmp_path, abs_path)
 
     if open_browser:
         if platform.system() == "Darwin":
@@ -180,85 +280,10 @@ def _get_hex_color(rarity: float) -> str:
     return "#808080"
 
 
-def _add_marker(m: folium.Map, f: dict) -> None:
-    """Add a single flight marker to a Folium map from a flight dict."""
-    lat = f["latitude"]
-    lon = f["longitude"]
-    rarity = f.get("rarity", 0)
-    tier = f.get("tier", "Unknown")
-    typecode = f.get("typecode", "")
-    aircraft_name = f.get("aircraft_name", typecode) or typecode
-    xp = f.get("xp", 0) or 0
-    reg = f.get("registration", "") or ""
-    callsign = f.get("callsign", "") or ""
-    altitude = f.get("altitude", 0) or 0
-    speed = f.get("ground_speed", 0) or 0
-    origin = f.get("origin", "") or ""
-    destination = f.get("destination", "") or ""
-
-    route = f"{origin} \u2192 {destination}" if origin and destination else origin or destination or "\u2014"
-    fr24_url = f"https://www.flightradar24.com/{callsign}" if callsign else ""
-
-    popup_html = f"""
-    <div style="font-family: Arial, sans-serif; min-width: 220px;">
-        <h4 style="margin: 0 0 8px 0; color: #333;">{aircraft_name}</h4>
-        <table style="font-size: 13px; border-collapse: collapse;">
-            <tr><td style="padding: 2px 8px 2px 0; color: #666;"><b>Rarity</b></td>
-                <td><b>{rarity:.2f}</b> ({tier})</td></tr>
-            <tr><td style="padding: 2px 8px 2px 0; color: #666;"><b>XP</b></td>
-                <td>{xp:,}</td></tr>
-            <tr><td style="padding: 2px 8px 2px 0; color: #666;"><b>Type</b></td>
-                <td>{typecode}</td></tr>
-            <tr><td style="padding: 2px 8px 2px 0; color: #666;"><b>Reg</b></td>
-                <td>{reg}</td></tr>
-            <tr><td style="padding: 2px 8px 2px 0; color: #666;"><b>Callsign</b></td>
-                <td>{callsign}</td></tr>
-            <tr><td style="padding: 2px 8px 2px 0; color: #666;"><b>Route</b></td>
-                <td>{route}</td></tr>
-            <tr><td style="padding: 2px 8px 2px 0; color: #666;"><b>Altitude</b></td>
-                <td>{altitude:,} ft</td></tr>
-            <tr><td style="padding: 2px 8px 2px 0; color: #666;"><b>Speed</b></td>
-                <td>{speed} kts</td></tr>
-        </table>
-        {"<a href='" + fr24_url + "' target='_blank' style='display:block;margin-top:8px;'>View on FlightRadar24</a>" if fr24_url else ""}
-    </div>
-    """
-
-    hex_color = _get_hex_color(rarity)
-    rarity_label = f"{rarity:.1f}"
-
-    icon_html = f"""<div class="rarity-pin" style="background:{hex_color};">{rarity_label}</div>"""
-
-    folium.Marker(
-        location=[lat, lon],
-        popup=folium.Popup(popup_html, max_width=300),
-        tooltip=f"{aircraft_name} | {rarity:.2f} ({tier}) | {xp:,} XP",
-        icon=folium.DivIcon(
-            html=icon_html,
-            icon_size=(40, 20),
-            icon_anchor=(20, 10),
-            class_name="rarity-marker",
-        ),
-    ).add_to(m)
-
-
 # ---------------------------------------------------------------------------
 # Server mode: returns HTML string with refresh button + live-update JS
 # ---------------------------------------------------------------------------
 
-# Map from rarity score to Leaflet awesome-markers color name
-_COLOR_MAP = [
-    (10.0, "darkred"),
-    (8.0, "red"),
-    (6.0, "orange"),
-    (4.0, "green"),
-    (2.0, "blue"),
-    (0.0, "gray"),
-]
-
-# Map from rarity score to FontAwesome icon name
-_ICON_MAP = [(8.0, "star"), (0.0, "plane")]
-
 
 def generate_map_html(
     flights: List[dict],
@@ -275,10 +300,15 @@ def generate_map_html(
     Returns:
         HTML string ready to serve.
     """
-    # Determine center
+    # Determine center in a single pass over the flight dicts
     if flights:
-        center_lat = sum(f["latitude"] for f in flights) / len(flights)
-        center_lon = sum(f["longitude"] for f in flights) / len(flights)
+        lat_sum = 0.0
+        lon_sum = 0.0
+        for f in flights:
+            lat_sum += f["latitude"]
+            lon_sum += f["longitude"]
+        center_lat = lat_sum / len(flights)
+        center_lon = lon_sum / len(flights)
     else:
         center_lat, center_lon = 30.0, 0.0
 
@@ -321,9 +351,13 @@ def generate_map_html(
     """
     m.get_root().html.add_child(folium.Element(pin_css))
 
-    # Add initial markers
-    for f in flights:
-        _add_marker(m, f)
+    # Leaflet.markercluster: bucketizes markers by tile so zoomed-out views
+    # paint a few hundred cluster icons instead of thousands of pins
+    m.get_root().header.add_child(folium.Element(
+        '<link rel="stylesheet" href="https://unpkg.com/leaflet.markercluster@1.5.3/dist/MarkerCluster.css"/>\n'
+        '<link rel="stylesheet" href="https://unpkg.com/leaflet.markercluster@1.5.3/dist/MarkerCluster.Default.css"/>\n'
+        '<script src="https://unpkg.com/leaflet.markercluster@1.5.3/dist/leaflet.markercluster.js"></script>'
+    ))
 
     # Legend
     legend_html = """
@@ -395,6 +429,13 @@ def generate_map_html(
     """
     m.get_root().html.add_child(folium.Element(refresh_ui))
 
+    # Initial flight payload as plain JSON — marker construction happens
+    # entirely in the browser, so the server render pays no per-flight
+    # Folium/Jinja cost
+    m.get_root().script.add_child(
+        folium.Element(f"window.__initialFlights = {json.dumps(flights)};")
+    )
+
     # JavaScript for live refresh.
     # IMPORTANT: This must be injected via m.get_root().script so it runs
     # AFTER Folium's own map initialization script (which declares the map var).
@@ -409,26 +450,18 @@ def generate_map_html(
     // Bridge: expose the Folium map variable globally
     window.__map = {map_var};
 
-    // Separate layer groups for toggling
-    var ultraGroup = L.layerGroup().addTo(window.__map);
+    // Separate layer groups for toggling. Rare planes cluster at low zoom
+    // so worldwide result sets stay cheap to paint; the handful of
+    // challenge pins stay un-clustered and always visible.
+    var ultraGroup = L.markerClusterGroup({{
+        chunkedLoading: true,
+        chunkInterval: 50,
+        disableClusteringAtZoom: 7
+    }}).addTo(window.__map);
     var challengeGroup = L.layerGroup().addTo(window.__map);
     var showUltra = true;
     var showChallenges = true;
 
-    // Move initial markers into ultraGroup
-    (function() {{
-        var layers = [];
-        window.__map.eachLayer(function(layer) {{
-            if (layer instanceof L.Marker) {{
-                layers.push(layer);
-            }}
-        }});
-        layers.forEach(function(layer) {{
-            window.__map.removeLayer(layer);
-            ultraGroup.addLayer(layer);
-        }});
-    }})();
-
     // Toggle functions
     window.toggleUltra = function() {{
         showUltra = !showUltra;
@@ -488,7 +521,31 @@ def generate_map_html(
             + fr24 + '</div>';
     }}
 
-    function createMarker(f) {{
+    // Above this many markers, switch from per-marker DOM divIcons to
+    // circle markers on a single shared canvas so zoomed-out loads don't
+    // stall the browser on thousands of SVG/DOM nodes
+    var CANVAS_THRESHOLD = 1000;
+    var canvasRenderer = L.canvas({{padding: 0.5}});
+
+    function createMarker(f, useCanvas) {{
+        var tooltip = f.aircraft_name + ' | ' + f.rarity.toFixed(2) + ' (' + f.tier + ') | ' + f.xp.toLocaleString() + ' XP';
+        if (f.challenge) tooltip = 'Challenge ' + f.challenge + ': ' + tooltip;
+
+        if (useCanvas && !f.challenge) {{
+            var circle = L.circleMarker([f.latitude, f.longitude], {{
+                renderer: canvasRenderer,
+                radius: 7,
+                fillColor: getHexColor(f.rarity),
+                fillOpacity: 0.9,
+                stroke: true,
+                color: '#fff',
+                weight: 1
+            }});
+            circle.bindPopup(buildPopup(f), {{maxWidth: 300}});
+            circle.bindTooltip(tooltip);
+            return circle;
+        }}
+
         var iconHtml, iconSize, iconAnchor;
         if (f.challenge) {{
             iconHtml = '<div class="challenge-pin">' + f.challenge + '</div>';
@@ -510,12 +567,23 @@ def generate_map_html(
             }})
         }});
         marker.bindPopup(buildPopup(f), {{maxWidth: 300}});
-        var tooltip = f.aircraft_name + ' | ' + f.rarity.toFixed(2) + ' (' + f.tier + ') | ' + f.xp.toLocaleString() + ' XP';
-        if (f.challenge) tooltip = 'Challenge ' + f.challenge + ': ' + tooltip;
         marker.bindTooltip(tooltip);
         return marker;
     }}
 
+    // Initial markers: rendered server-side as one JSON payload, built
+    // client-side with the same createMarker used by refresh
+    var initialFlights = window.__initialFlights || [];
+    var initialUseCanvas = initialFlights.length > CANVAS_THRESHOLD;
+    initialFlights.forEach(function(f) {{
+        var marker = createMarker(f, initialUseCanvas);
+        if (f.challenge) {{
+            challengeGroup.addLayer(marker);
+        }} else {{
+            ultraGroup.addLayer(marker);
+        }}
+    }});
+
     window.refreshFlights = function() {{
         var btn = document.getElementById('refresh-btn');
         var countEl = document.getElementById('flight-count');
@@ -533,8 +601,9 @@ def generate_map_html(
                 challengeGroup.clearLayers();
 
                 // Add new markers to appropriate groups
+                var useCanvas = data.flights.length > CANVAS_THRESHOLD;
                 data.flights.forEach(function(f) {{
-                    var marker = createMarker(f);
+                    var marker = createMarker(f, useCanvas);
                     if (f.challenge) {{
                         challengeGroup.addLayer(marker);
                     }} else {{
@@ -18,7 +18,28 @@ TIERS = {
 }
 
 
-def assign_rarity(flights_df: pl.DataFrame, lookup: dict = None) -> pl.DataFrame:
+def build_rarity_frame(lookup: dict) -> pl.DataFrame:
+    """Convert a rarity lookup dict into the join-ready mapping DataFrame.
+
+    Long-running callers (server mode) should build this once and pass it
+    to :func:`assign_rarity` so repeated refreshes skip the dict -> frame
+    conversion and go straight to the hash join.
+    """
+    codes = list(lookup.keys())
+    return pl.DataFrame({
+        "typecode": codes,
+        "rarity": [lookup[c]["rarity_display"] for c in codes],
+        "tier": [TIERS.get(lookup[c]["category"], lookup[c]["category"].title()) for c in codes],
+        "aircraft_name": [lookup[c]["name"] for c in codes],
+        "xp": [lookup[c]["xp"] for c in codes],
+    })
+
+
+def assign_rarity(
+    flights_df: pl.DataFrame,
+    lookup: dict = None,
+    rarity_df: pl.DataFrame = None,
+) -> pl.DataFrame:
     """Assign real Skycards rarity scores to each flight.
 
     Fetches the official rarity database from the Skycards API and joins
@@ -27,6 +48,8 @@ def assign_rarity(flights_df: pl.DataFrame, lookup: dict = None) -> pl.DataFrame
     Args:
         flights_df: DataFrame with at least a 'typecode' column.
         lookup: Optional pre-built rarity lookup dict. If None, fetches fresh.
+        rarity_df: Optional pre-built mapping frame from
+            :func:`build_rarity_frame`; takes precedence over ``lookup``.
 
     Returns:
         The input DataFrame with added columns:
@@ -36,7 +59,7 @@ def assign_rarity(flights_df: pl.DataFrame, lookup: dict = None) -> pl.DataFrame
             - xp: int (XP awarded for capture)
         Sorted by rarity descending.
     """
-    if len(flights_df) == 0:
+    if flights_df.is_empty():
         return flights_df.with_columns(
             pl.lit(0.0).alias("rarity"),
             pl.lit("Common").alias("tier"),
@@ -44,18 +67,10 @@ def assign_rarity(flights_df: pl.DataFrame, lookup: dict = None) -> pl.DataFrame
             pl.lit(0).alias("xp"),
         )
 
-    if lookup is None:
-        lookup = build_rarity_lookup()
-
-    # Build mapping DataFrames
-    codes = list(lookup.keys())
-    rarity_df = pl.DataFrame({
-        "typecode": codes,
-        "rarity": [lookup[c]["rarity_display"] for c in codes],
-        "tier": [TIERS.get(lookup[c]["category"], lookup[c]["category"].title()) for c in codes],
-        "aircraft_name": [lookup[c]["name"] for c in codes],
-        "xp": [lookup[c]["xp"] for c in codes],
-    })
+    if rarity_df is None:
+        if lookup is None:
+            lookup = build_rarity_lookup()
+        rarity_df = build_rarity_frame(lookup)
 
     result = flights_df.join(rarity_df, on="typecode", how="left")
 
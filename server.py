@@ -2,9 +2,17 @@
 
 from __future__ import annotations
 
-from typing import List, Optional, Tuple
+import hashlib
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
 
-from flask import Flask, jsonify
+import orjson
+import polars as pl
+from flask import Flask, Response, request
 
 from fr24_client import fetch_live_flights
 from rarity import assign_rarity
@@ -12,19 +20,69 @@ from map_generator import generate_map_html
 
 app = Flask(__name__)
 
-# Set by main.py before starting
-_config = {
-    "min_rarity": 10.0,
-    "bounds": None,
-    "challenges": None,  # list of challenge text strings, or None
-}
+# Compress responses when flask-compress is available — the flights JSON
+# is highly repetitive (repeated keys, short strings) and shrinks 5-10x,
+# which matters for browsers polling /api/flights on a timer
+try:
+    from flask_compress import Compress
+except ImportError:
+    pass
+else:
+    app.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+    app.config["COMPRESS_MIN_SIZE"] = 512
+    Compress(app)
+
+# Set by main.py before starting. Frozen so hot-path reads are plain
+# attribute access and nothing can mutate settings mid-request.
+@dataclass(frozen=True)
+class _Config:
+    min_rarity: float = 10.0
+    bounds: Optional[Tuple[float, ...]] = None
+    challenges: Optional[List[str]] = None  # challenge text strings, or None
+
+
+_cfg = _Config()
 
 # Cached rarity lookup — built once at startup, reused on every refresh
 _rarity_lookup = None
 
+# Join-ready rarity mapping frame, built once from the lookup so each
+# refresh goes straight to the Rust-side hash join
+_rarity_df = None
+
 # Parsed challenge filters — built once at startup from challenge text
 _parsed_challenges = None
 
+# Rendered index HTML (UTF-8 bytes) — built once at startup; every page
+# load writes the same bytes to the socket and the browser populates
+# markers via /api/flights
+_cached_html = None
+
+# Short-TTL cache of the serialized /api/flights payload. Coalesces
+# refreshes from multiple tabs/clients into one pipeline run per window.
+# No cache key needed: bounds/min_rarity/challenges are fixed per process.
+_API_CACHE_TTL_S = 3.0
+_api_cache = {"t": 0.0, "payload": None, "etag": None}
+_api_cache_lock = threading.Lock()
+
+# Background refresher: rebuilds the serialized payload on a fixed cadence
+# so requests serve the latest snapshot instead of blocking on the FR24
+# fetch. The snapshot is published as one immutable (t, payload, etag)
+# tuple in a single slot reassignment (atomic in CPython), so readers
+# never pair an old payload with a new ETag and need no lock.
+REFRESH_INTERVAL_S = 15.0
+_SNAPSHOT_MAX_AGE_S = REFRESH_INTERVAL_S * 2
+_snapshot = {"v": (0.0, None, None)}
+
+# Singleton response body for the no-flights case (narrow bounds, quiet
+# hours) — skips Polars and serialization entirely
+_EMPTY_PAYLOAD = b'{"flights":[],"count":0}'
+
+# Cap on flights per response. More markers than this aren't visually
+# useful, and the cap bounds serialization cost during traffic surges.
+# The frame is sorted by rarity first, so head() keeps the rarest ones.
+MAX_FLIGHTS = int(os.environ.get("SKYCARDS_MAX_FLIGHTS", "500"))
+
 
 def configure(
     min_rarity: float = 10.0,
@@ -32,14 +90,15 @@ def configure(
     challenges: Optional[List[str]] = None,
 ) -> None:
     """Set server configuration and pre-cache rarity data."""
-    _config["min_rarity"] = min_rarity
-    _config["bounds"] = bounds
-    _config["challenges"] = challenges
+    global _cfg
+    _cfg = _Config(min_rarity=min_rarity, bounds=bounds, challenges=challenges)
 
     # Pre-cache the Skycards rarity lookup so refreshes are fast
-    global _rarity_lookup
+    global _rarity_lookup, _rarity_df
     from skycards_api import build_rarity_lookup
+    from rarity import build_rarity_frame
     _rarity_lookup = build_rarity_lookup()
+    _rarity_df = build_rarity_frame(_rarity_lookup)
     print(f"  Cached {len(_rarity_lookup):,} aircraft types from Skycards")
 
     # Pre-parse challenges so each refresh is fast
@@ -50,31 +109,122 @@ def configure(
         for i, ch in enumerate(_parsed_challenges, 1):
             print(f"  Challenge {i}: {ch.description}")
 
+    # Pre-render the map shell once — page loads then skip the Folium/Jinja
+    # render entirely and markers arrive via /api/flights
+    global _cached_html
+    challenge_texts = None
+    if _parsed_challenges:
+        challenge_texts = [ch.original_text for ch in _parsed_challenges]
+    _cached_html = generate_map_html(
+        [], min_rarity=min_rarity, challenge_texts=challenge_texts
+    ).encode("utf-8")
+
+
+# Null defaults applied in Polars once per refresh, so the per-row dict
+# builder can index columns directly instead of chaining `.get(...) or ...`
+_FIELD_DEFAULTS = {
+    "rarity": 0.0,
+    "tier": "Unknown",
+    "typecode": "",
+    "aircraft_name": "",
+    "xp": 0,
+    "registration": "",
+    "callsign": "",
+    "altitude": 0,
+    "ground_speed": 0,
+    "origin": "",
+    "destination": "",
+}
+
+# JSON key tuple for per-row dict construction, interned once so every
+# row builder call reuses the same key objects instead of re-hashing
+# fresh strings per row
+_ROW_KEYS = tuple(sys.intern(k) for k in ("latitude", "longitude", *_FIELD_DEFAULTS))
+
+
+def _compile_row_builder() -> Callable:
+    """Generate a row-values -> dict function specialized to _ROW_KEYS.
+
+    The schema is fixed, so a literal dict display (one BUILD_MAP opcode
+    with constant keys) beats dict(zip(...)) re-walking the key tuple on
+    every row.
+    """
+    args = [f"a{i}" for i in range(len(_ROW_KEYS))]
+    items = ", ".join(f"{k!r}: {a}" for k, a in zip(_ROW_KEYS, args))
+    src = (
+        f"def _make_row(vals):\n"
+        f"    {', '.join(args)} = vals\n"
+        f"    return {{{items}}}\n"
+    )
+    ns: dict = {}
+    exec(compile(src, "<row-builder>", "exec"), ns)
+    return ns["_make_row"]
+
+
+_make_row = _compile_row_builder()
+
+
+def _fill_defaults(df: pl.DataFrame) -> pl.DataFrame:
+    """Coalesce nulls for all JSON-facing columns in one columnar pass."""
+    return df.with_columns(
+        [pl.col(c).fill_null(d) for c, d in _FIELD_DEFAULTS.items()]
+    )
+
+
+def _clip_to_bounds(df: pl.DataFrame) -> pl.DataFrame:
+    """Drop flights outside the configured bounding box before enrichment.
+
+    FR24 already scopes the fetch to the bbox, but returned positions can
+    straddle the edges (the query is tile-based). Shrinking the frame here
+    means the rarity join runs on fewer rows.
+    """
+    if _cfg.bounds is None:
+        return df
+    south, north, west, east = _cfg.bounds
+    return df.filter(
+        pl.col("latitude").is_between(south, north)
+        & pl.col("longitude").is_between(west, east)
+    )
+
+
+def _filter_rare(enriched: pl.DataFrame) -> pl.DataFrame:
+    """Apply the rarity threshold and valid-position filter, sorted by rarity.
 
-def _flight_to_dict(row: dict, challenge_label: str = "") -> Optional[dict]:
-    """Convert a flight row to a dict for JSON, or None if invalid position."""
-    lat = row.get("latitude")
-    lon = row.get("longitude")
-    if lat is None or lon is None or (lat == 0 and lon == 0):
-        return None
-    d = {
-        "latitude": lat,
-        "longitude": lon,
-        "rarity": row.get("rarity", 0),
-        "tier": row.get("tier", "Unknown"),
-        "typecode": row.get("typecode", ""),
-        "aircraft_name": row.get("aircraft_name", "") or "",
-        "xp": row.get("xp", 0) or 0,
-        "registration": row.get("registration", "") or "",
-        "callsign": row.get("callsign", "") or "",
-        "altitude": row.get("altitude", 0) or 0,
-        "ground_speed": row.get("ground_speed", 0) or 0,
-        "origin": row.get("origin", "") or "",
-        "destination": row.get("destination", "") or "",
-    }
-    if challenge_label:
-        d["challenge"] = challenge_label
-    return d
+    The threshold and the null/(0,0) coordinate rejection run as one
+    vectorized predicate, so rows we'd discard anyway never cross the
+    columnar -> Python boundary. The sorted flag is set explicitly on
+    the rarity column so downstream slices/max lookups take Polars'
+    sorted fast paths.
+    """
+    return (
+        enriched.filter(
+            (pl.col("rarity") >= _cfg.min_rarity)
+            & pl.col("latitude").is_not_null()
+            & pl.col("longitude").is_not_null()
+            & ~((pl.col("latitude") == 0) & (pl.col("longitude") == 0))
+        )
+        .sort("rarity", descending=True)
+        .with_columns(pl.col("rarity").set_sorted(descending=True))
+    )
+
+
+def _rare_flights_payload() -> bytes:
+    """Serialize the rare-flights response straight from Polars.
+
+    Fast path for the no-challenge configuration: the filtered frame is
+    written to JSON row-by-row in Rust via write_json, skipping the
+    list-of-dicts intermediate and the second Python encoding pass.
+    """
+    flights_df = fetch_live_flights(_cfg.bounds)
+    if flights_df.is_empty():
+        return _EMPTY_PAYLOAD
+    flights_df = _clip_to_bounds(flights_df)
+    enriched = _fill_defaults(assign_rarity(flights_df, lookup=_rarity_lookup, rarity_df=_rarity_df))
+    rare = _filter_rare(enriched).head(MAX_FLIGHTS)
+    if rare.is_empty():
+        return _EMPTY_PAYLOAD
+    body = rare.select(["latitude", "longitude", *_FIELD_DEFAULTS]).write_json()
+    return b'{"flights":%s,"count":%d}' % (body.encode(), rare.height)
 
 
 def _fetch_rare_flights() -> list:
@@ -83,23 +233,24 @@ def _fetch_rare_flights() -> list:
     Always returns rare planes (by min_rarity). When challenges are active,
     also includes challenge matches tagged with their challenge text.
     """
-    flights_df = fetch_live_flights(_config["bounds"])
-    if len(flights_df) == 0:
+    flights_df = fetch_live_flights(_cfg.bounds)
+    if flights_df.is_empty():
         return []
-    enriched = assign_rarity(flights_df, lookup=_rarity_lookup)
-
-    seen_ids: set = set()
-    results: list = []
+    flights_df = _clip_to_bounds(flights_df)
+    enriched = _fill_defaults(assign_rarity(flights_df, lookup=_rarity_lookup, rarity_df=_rarity_df))
 
     # Always include rare planes
-    rare = enriched.filter(enriched["rarity"] >= _config["min_rarity"])
-    rare = rare.sort("rarity", descending=True)
-    for row in rare.iter_rows(named=True):
-        d = _flight_to_dict(row)
-        if d:
-            fid = row.get("flightid")
-            seen_ids.add(fid)
-            results.append(d)
+    rare = _filter_rare(enriched).head(MAX_FLIGHTS)
+    # Extract each column to Python once and zip — columnar extraction
+    # amortizes the per-cell conversion that iter_rows(named=True) pays
+    # per row. The id set and result list are built in single C-level
+    # passes instead of per-row add/append calls.
+    col_names = ["flightid", "latitude", "longitude", *_FIELD_DEFAULTS]
+    cols = rare.select(col_names).to_dict(as_series=False)
+    seen_ids: set = set(cols["flightid"])
+    results: list = [
+        _make_row(vals) for vals in zip(*(cols[n] for n in col_names[1:]))
+    ]
 
     # Add challenge matches (tagged with challenge number, deduplicated)
     if _parsed_challenges:
@@ -109,48 +260,122 @@ def _fetch_rare_flights() -> list:
         ch_number = {ch.original_text: i for i, ch in enumerate(_parsed_challenges, 1)}
 
         results_by_challenge = run_challenges(enriched, _parsed_challenges)
+        cs_idx = _ROW_KEYS.index("callsign")
         for challenge, matches_df in results_by_challenge:
             num = ch_number[challenge.original_text]
-            for row in matches_df.iter_rows(named=True):
-                fid = row.get("flightid")
+            # Positional unpacking after a fixed select — same trick as
+            # the rare loop above, no per-cell dict hashing
+            match_rows = matches_df.select(col_names).iter_rows()
+            for fid, *vals in match_rows:
                 if fid in seen_ids:
                     # Already on map as rare — just tag it with challenge too
                     for existing in results:
-                        if existing.get("callsign") == (row.get("callsign") or ""):
+                        if existing.get("callsign") == vals[cs_idx]:
                             existing.setdefault("challenge", num)
                             break
                     continue
+                lat, lon = vals[0], vals[1]
+                if lat is None or lon is None or (lat == 0 and lon == 0):
+                    continue
                 seen_ids.add(fid)
-                d = _flight_to_dict(row, challenge_label=num)
-                if d:
-                    results.append(d)
+                d = _make_row(vals)
+                d["challenge"] = num
+                results.append(d)
 
     return results
 
 
 @app.route("/")
 def index():
-    """Serve an empty map shell that auto-refreshes on load for instant startup."""
+    """Serve the map shell, pre-rendered once at configure() time."""
+    if _cached_html is not None:
+        return Response(_cached_html, mimetype="text/html")
+    # Fallback if configure() wasn't called (e.g. running server.py directly)
     challenge_texts = None
     if _parsed_challenges:
         challenge_texts = [ch.original_text for ch in _parsed_challenges]
-    html = generate_map_html(
-        [], min_rarity=_config["min_rarity"], challenge_texts=challenge_texts
+    return generate_map_html(
+        [], min_rarity=_cfg.min_rarity, challenge_texts=challenge_texts
     )
-    return html
+
+
+def _build_payload() -> bytes:
+    """Run the full fetch/enrich/serialize pipeline to response bytes."""
+    if _parsed_challenges:
+        # Challenge tagging mutates per-flight dicts, so this path keeps
+        # the Python pipeline; orjson still does the final encode in Rust
+        flights = _fetch_rare_flights()
+        resp = {
+            "flights": flights,
+            "count": len(flights),
+            "challenges": [
+                {"text": ch.original_text, "description": ch.description}
+                for ch in _parsed_challenges
+            ],
+        }
+        return orjson.dumps(resp)
+    return _rare_flights_payload()
+
+
+def _etag_of(payload: bytes) -> str:
+    """Compute the strong ETag for a serialized payload."""
+    return '"%s"' % hashlib.blake2b(payload, digest_size=8).hexdigest()
+
+
+def _json_response(payload: bytes, etag: Optional[str]) -> Response:
+    """Wrap payload bytes in a JSON response, honoring If-None-Match.
+
+    When the client already holds the current payload (unchanged snapshot
+    between polls), a bodyless 304 replaces the full write and the
+    client-side JSON parse.
+    """
+    if etag is not None:
+        if request.headers.get("If-None-Match") == etag:
+            return Response(status=304, headers={"ETag": etag})
+        return Response(
+            payload,
+            mimetype="application/json",
+            headers={"ETag": etag, "Cache-Control": "no-cache"},
+        )
+    return Response(payload, mimetype="application/json")
+
+
+def _refresher() -> None:
+    """Background loop: refresh the payload snapshot every REFRESH_INTERVAL_S."""
+    while True:
+        try:
+            payload = _build_payload()
+            _snapshot["v"] = (time.monotonic(), payload, _etag_of(payload))
+        except Exception as e:
+            # Keep serving the last good snapshot on transient failures
+            print(f"  Warning: background refresh failed: {e}")
+        time.sleep(REFRESH_INTERVAL_S)
 
 
 @app.route("/api/flights")
 def api_flights():
-    """Return current rare flights as JSON."""
-    flights = _fetch_rare_flights()
-    resp = {"flights": flights, "count": len(flights)}
-    if _parsed_challenges:
-        resp["challenges"] = [
-            {"text": ch.original_text, "description": ch.description}
-            for ch in _parsed_challenges
-        ]
-    return jsonify(resp)
+    """Return current rare flights as JSON.
+
+    Serves the background refresher's snapshot when fresh, so the request
+    thread never blocks on FR24. Falls back to the short-TTL on-demand
+    cache if the snapshot is stale or the refresher isn't running.
+    """
+    t, payload, etag = _snapshot["v"]
+    if payload is not None and time.monotonic() - t < _SNAPSHOT_MAX_AGE_S:
+        return _json_response(payload, etag)
+
+    with _api_cache_lock:
+        payload = _api_cache["payload"]
+        if payload is not None and time.monotonic() - _api_cache["t"] < _API_CACHE_TTL_S:
+            return _json_response(payload, _api_cache["etag"])
+
+    payload = _build_payload()
+    etag = _etag_of(payload)
+    with _api_cache_lock:
+        _api_cache["t"] = time.monotonic()
+        _api_cache["payload"] = payload
+        _api_cache["etag"] = etag
+    return _json_response(payload, etag)
 
 
 def start(port: int = 5050) -> None:
@@ -185,6 +410,17 @@ def start(port: int = 5050) -> None:
     except subprocess.CalledProcessError:
         pass  # nothing on that port
 
+    # Keep the flight snapshot warm off the request thread
+    threading.Thread(target=_refresher, name="flight-refresher", daemon=True).start()
+
     print(f"\n  Server running at http://localhost:{port}")
     print("  Press Ctrl+C to stop\n")
-    app.run(host="127.0.0.1", port=port, debug=False)
+    try:
+        from waitress import serve
+    except ImportError:
+        # Werkzeug dev server fallback — serializes concurrent clients
+        app.run(host="127.0.0.1", port=port, debug=False)
+    else:
+        # Thread-pooled WSGI server: one slow request (cold snapshot)
+        # doesn't block other clients hitting the cached path
+        serve(app, host="127.0.0.1", port=port, threads=8)
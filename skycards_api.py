@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import json
 import os
 import time
@@ -65,9 +66,14 @@ def get_models() -> dict:
     return data
 
 
+@functools.lru_cache(maxsize=1)
 def build_rarity_lookup() -> Dict[str, dict]:
     """Build a lookup dict from ICAO type code to rarity info.
 
+    Memoized for the process lifetime so server-mode refreshes (and any
+    repeated callers) build the lookup once. Callers must treat the
+    returned dict as read-only.
+
     Returns:
         Dict mapping typecode -> {
             "name": str,